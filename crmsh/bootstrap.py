@@ -2139,10 +2139,9 @@ def stop_and_disable_services(remote_addr=None):
     Stop and disable cluster related service
     """
     service_manager = ServiceManager()
-    for service in SERVICES_STOP_LIST:
-        if service_manager.service_is_active(service, remote_addr=remote_addr):
-            logger.info("Stopping and disable %s on node %s", service, remote_addr or utils.this_node())
-            service_manager.stop_service(service, disable=True, remote_addr=remote_addr)
+    for service in service_manager.services_active(SERVICES_STOP_LIST, remote_addr=remote_addr):
+        logger.info("Stopping and disable %s on node %s", service, remote_addr or utils.this_node())
+        service_manager.stop_service(service, disable=True, remote_addr=remote_addr)
     for service in SERVICES_DISABLE_LIST:
         if service_manager.service_is_enabled(service, remote_addr=remote_addr):
             logger.info("Disable %s on node %s", service, remote_addr or utils.this_node())
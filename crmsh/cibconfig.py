@@ -1392,9 +1392,9 @@ class Op(object):
             idmgmt.remove_xml(self.node)
         self.node = etree.Element(self.elem_type)
         inst_attr = {}
-        valid_attrs = utils.olist(schema.get('attr', 'op', 'a'))
+        valid_attrs = frozenset(a.lower() for a in schema.get('attr', 'op', 'a'))
         for n, v in self.attr_d.items():
-            if n in valid_attrs:
+            if n.lower() in valid_attrs:
                 self.node.set(n, v)
             else:
                 inst_attr[n] = v
@@ -1485,10 +1485,10 @@ class CibPrimitive(CibObject):
         # create an xml node
         if 'id' not in node.attrib:
             idmgmt.set_id(node, None, self.obj_id)
-        valid_attrs = utils.olist(schema.get('attr', 'op', 'a'))
+        valid_attrs = frozenset(a.lower() for a in schema.get('attr', 'op', 'a'))
         inst_attr = {}
         for attr in list(node.attrib.keys()):
-            if attr not in valid_attrs:
+            if attr.lower() not in valid_attrs:
                 inst_attr[attr] = node.attrib[attr]
                 del node.attrib[attr]
         if inst_attr:
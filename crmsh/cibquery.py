@@ -20,6 +20,18 @@ class ClusterNode:
     uname: str
 
 
+_NODE_XPATH = lxml.etree.XPath(constants.XML_NODE_PATH)
+_NODE_NAME_BY_ID_XPATH = lxml.etree.XPath('/cib/configuration/nodes/node[@id=$node_id]/@uname')
+_PRIMITIVE_FILESYSTEM_WITH_FSTYPE_XPATH = lxml.etree.XPath(
+    '/cib/configuration/resources//primitive[@class="ocf" and @provider="heartbeat" and @type="Filesystem"]'
+    '/instance_attributes/nvpair[@name="fstype" and @value=$fstype]'
+)
+_PARAMETER_VALUE_XPATH = lxml.etree.XPath(
+    '/cib/configuration/resources//primitive[@id=$res_id]'
+    '/instance_attributes/nvpair[@name=$param_name]/@value'
+)
+
+
 def get_configured_resource_agents(cib: lxml.etree.Element) -> typing.Set[ResourceAgent]:
     return set(
         ResourceAgent(e.get('class'), e.get('provider'), e.get('type'))
@@ -28,10 +40,7 @@ def get_configured_resource_agents(cib: lxml.etree.Element) -> typing.Set[Resour
 
 
 def has_primitive_filesystem_with_fstype(cib: lxml.etree.Element, fstype: str) -> bool:
-    return bool(cib.xpath(
-        '/cib/configuration/resources//primitive[@class="ocf" and @provider="heartbeat" and @type="Filesystem"]'
-        f'/instance_attributes/nvpair[@name="fstype" and @value="{fstype}"]'
-    ))
+    return bool(_PRIMITIVE_FILESYSTEM_WITH_FSTYPE_XPATH(cib, fstype=fstype))
 
 
 def get_primitives_with_ra(cib: lxml.etree.Element, ra: ResourceAgent) -> list[str]:
@@ -46,17 +55,14 @@ def get_primitives_with_ra(cib: lxml.etree.Element, ra: ResourceAgent) -> list[s
 
 
 def get_parameter_value(cib: lxml.etree.Element, res_id: str, param_name: str) -> typing.Optional[str]:
-    result = cib.xpath(
-        f'/cib/configuration/resources//primitive[@id="{res_id}"]'
-        f'/instance_attributes/nvpair[@name="{param_name}"]/@value'
-    )
+    result = _PARAMETER_VALUE_XPATH(cib, res_id=res_id, param_name=param_name)
     return result[0] if result else None
 
 
 def get_cluster_nodes(cib: lxml.etree.Element) -> list[ClusterNode]:
     """Return a list of cluster nodes, excluding pacemaker-remote nodes"""
     result = list()
-    for element in cib.xpath(constants.XML_NODE_PATH):
+    for element in _NODE_XPATH(cib):
         node_id = element.get('id')
         uname = element.get('uname')
         if element.get('type') == 'remote':
@@ -69,6 +75,5 @@ def get_cluster_nodes(cib: lxml.etree.Element) -> list[ClusterNode]:
 
 def get_node_name_by_id(cib: lxml.etree.Element, node_id: int) -> typing.Optional[str]:
     """Return the node name for a given node ID"""
-    xpath = f"/cib/configuration/nodes/node[@id='{node_id}']/@uname"
-    result = cib.xpath(xpath)
+    result = _NODE_NAME_BY_ID_XPATH(cib, node_id=str(node_id))
     return result[0] if result else None
@@ -4,9 +4,14 @@
 Functions that abstract creating and editing the corosync.conf
 configuration file, and also the corosync-* utilities.
 '''
+import copy
 import dataclasses
+import functools
+import hashlib
+import itertools
 import os
 import re
+import shutil
 import typing
 from io import StringIO
 
@@ -43,6 +48,14 @@ logging {
 }
 """
 KNET_LINK_NUM_LIMIT = 8
+_RING_KEY_RE = re.compile(r"ring[1-7]_addr")
+_RING_ADDR_KEY_RE = re.compile(r"ring[0-7]_addr")
+# e.g. "runtime.config.totem.token (u32) = 3000"
+_CMAPCTL_LINE_RE = re.compile(r"^(\S+)\s+\(\S+\)\s+=\s+(.*)$", re.M)
+# path -> (st_mtime_ns, st_size, parsed dom)
+_CONF_CACHE: dict[str, tuple[int, int, dict]] = {}
+# path -> (st_mtime_ns, st_size, validation error or None if valid)
+_VALID_CONF_CACHE: dict[str, tuple[int, int, typing.Optional[str]]] = {}
 
 
 def is_knet() -> bool:
@@ -56,11 +69,8 @@ def is_using_ipv6() -> bool:
 
 
 def get_link_number() -> int:
-    link_num = 1
-    for key, value in ConfParser.get_value("nodelist.node").items():
-        if re.search("ring[1-7]_addr", key) and value:
-            link_num += 1
-    return link_num
+    items = ConfParser.get_value("nodelist.node").items()
+    return sum(1 for key, value in items if value and _RING_KEY_RE.match(key)) + 1
 
 
 def is_qdevice_configured() -> bool:
@@ -204,22 +214,25 @@ def pull_configuration(from_node):
            fname]
     rc = utils.ext_cmd_nosudo(cmd, shell=False)
     if rc == 0:
-        data = open(fname).read()
-        newhash = hash(data)
-        if os.path.isfile(local_path):
-            oldata = open(local_path).read()
-            oldhash = hash(oldata)
-            if newhash == oldhash:
-                print("No change.")
-                return
+        if os.path.isfile(local_path) and _file_digest(fname) == _file_digest(local_path):
+            print("No change.")
+            return
         print("Writing %s:%s..." % (utils.this_node(), local_path))
-        local_file = open(local_path, 'w')
-        local_file.write(data)
-        local_file.close()
+        shutil.copyfile(fname, local_path)
     else:
         raise ValueError("Failed to retrieve %s from %s" % (local_path, from_node))
 
 
+def _file_digest(path, chunk_size=1 << 16) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, 'rb') as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.digest()
+
+
 def diff_configuration(nodes, checksum=False):
     local_path = conf()
     this_node = utils.this_node()
@@ -239,12 +252,8 @@ def get_free_nodeid():
     ids = get_values('nodelist.node.nodeid')
     if not ids:
         return 1
-    ids = [int(i) for i in ids]
-    max_id = max(ids) + 1
-    for i in range(1, max_id):
-        if i not in ids:
-            return i
-    return max_id
+    id_set = {int(i) for i in ids}
+    return next(itertools.filterfalse(id_set.__contains__, itertools.count(1)))
 
 
 def get_value(path, index: int = 0):
@@ -268,8 +277,12 @@ def find_configured_ip(ip_list):
     find if the same IP already configured
     If so, raise IPAlreadyConfiguredError
     """
-    data = utils.read_from_file(conf())
-    corosync_iplist = re.findall('ring[0-7]_addr:\\s*(.*?)\n', data)
+    corosync_iplist = [
+        value
+        for node in ConfParser().get_all("nodelist.node")
+        for key, value in node.items()
+        if value and _RING_ADDR_KEY_RE.fullmatch(key)
+    ]
 
     # all_possible_ip is a ip set to check whether one of them already configured
     all_possible_ip = set(ip_list)
@@ -353,6 +366,10 @@ def del_node(addrs: list[str]) -> bool:
         return False
 
 
+@functools.lru_cache
+def _cmapctl_value_re(key: str) -> re.Pattern:
+    return re.compile(rf'{re.escape(key)}\s+.*=\s+(.*)')
+
 
 def get_corosync_value(key, cmapctl_prefix="runtime.config"):
     """
@@ -361,23 +378,41 @@ def get_corosync_value(key, cmapctl_prefix="runtime.config"):
     try:
         cmapctl_prefix = f"{cmapctl_prefix.strip('.')}." if cmapctl_prefix else ""
         out = sh.cluster_shell().get_stdout_or_raise_error(f"corosync-cmapctl {cmapctl_prefix}{key}")
-        res = re.search(r'{}\s+.*=\s+(.*)'.format(key), out)
+        res = _cmapctl_value_re(key).search(out)
         return res.group(1) if res else None
     except ValueError:
         out = get_value(key)
         return out
 
 
+def get_corosync_values(keys, cmapctl_prefix="runtime.config") -> dict:
+    """
+    Get several corosync configuration values with a single corosync-cmapctl call,
+    or from corosync.conf if corosync-cmapctl fails
+    Return a dict of key -> value, the value is None if not found
+    """
+    cmapctl_prefix = f"{cmapctl_prefix.strip('.')}." if cmapctl_prefix else ""
+    try:
+        out = sh.cluster_shell().get_stdout_or_raise_error(
+            f"corosync-cmapctl {cmapctl_prefix}{os.path.commonprefix(keys)}"
+        )
+    except ValueError:
+        return {key: get_value(key) for key in keys}
+    cmap = dict(_CMAPCTL_LINE_RE.findall(out))
+    return {key: cmap.get(f"{cmapctl_prefix}{key}") for key in keys}
+
+
 def get_corosync_value_dict():
     """
     Get corosync value, then return these values as dict
     """
     value_dict = {}
+    values = get_corosync_values(("totem.token", "totem.consensus"))
 
-    token = get_corosync_value("totem.token")
+    token = values["totem.token"]
     value_dict["token"] = int(int(token)/1000) if token else int(COROSYNC_TOKEN_DEFAULT/1000)
 
-    consensus = get_corosync_value("totem.consensus")
+    consensus = values["totem.consensus"]
     value_dict["consensus"] = int(int(consensus)/1000) if consensus else int(value_dict["token"]*1.2)
 
     return value_dict
@@ -398,17 +433,77 @@ def get_all_paths():
 def is_valid_corosync_conf(config_file=None) -> bool:
     """
     Check if corosync.conf is valid
+    The result is cached as long as the mtime and size of the file are unchanged.
     """
+    path = config_file or conf()
     try:
-        ConfParser(config_file=config_file)
-        corosync_verify_cmd = f"corosync -c {config_file} -t" if config_file else "corosync -t"
-        sh.cluster_shell().get_stdout_or_raise_error(corosync_verify_cmd)
-    except ValueError as e:
-        logger.error("Invalid %s: %s", config_file or conf(), e)
+        st = os.stat(path)
+    except OSError as e:
+        logger.error("Invalid %s: %s", path, e)
+        return False
+    cached = _VALID_CONF_CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        error = cached[2]
+    else:
+        try:
+            ConfParser(config_file=config_file)
+            corosync_verify_cmd = f"corosync -c {config_file} -t" if config_file else "corosync -t"
+            sh.cluster_shell().get_stdout_or_raise_error(corosync_verify_cmd)
+            error = None
+        except ValueError as e:
+            error = str(e)
+        _VALID_CONF_CACHE[path] = (st.st_mtime_ns, st.st_size, error)
+    if error is not None:
+        logger.error("Invalid %s: %s", path, error)
         return False
     return True
 
 
+def _load_dom(path: str) -> dict:
+    """
+    Parse the config file on path and return its dom
+
+    The parsed dom is cached and reused as long as the mtime and size of the file are unchanged.
+    The returned dom is shared with the cache and must not be modified by the caller.
+    """
+    try:
+        st = os.stat(path)
+        cached = _CONF_CACHE.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        with open(path, 'r', encoding='utf-8') as f:
+            dom = corosync_config_format.DomParser(f).dom()
+    except (OSError, corosync_config_format.ParserException) as e:
+        raise ValueError(str(e)) from None
+    _CONF_CACHE[path] = (st.st_mtime_ns, st.st_size, dom)
+    return dom
+
+
+def _invalidate_dom(path: str) -> None:
+    _CONF_CACHE.pop(path, None)
+    _VALID_CONF_CACHE.pop(path, None)
+
+
+def load_config_dom(path=None) -> dict:
+    """
+    Returns a copy of the parsed config file which is safe to modify,
+    with the known multi-value sections populated as lists
+    """
+    dom = copy.deepcopy(_load_dom(path or conf()))
+    ConfParser.transform_dom_with_list_schema(dom)
+    return dom
+
+
+def _write_dom(dom: dict, path: str, file_mode: int) -> None:
+    """Serialize the dom and write it to path atomically"""
+    buf = StringIO()
+    corosync_config_format.DomSerializer(dom, buf)
+    with utils.open_atomic(path, 'wb', fsync=True) as f:
+        f.write(buf.getvalue().encode('utf-8'))
+        os.fchmod(f.fileno(), file_mode)
+    _invalidate_dom(path)
+
+
 class ConfParser(object):
     """
     Class to parse config file which format like corosync.conf
@@ -417,6 +512,8 @@ class ConfParser(object):
 
     def __init__(self, config_file=None, config_data=None):
         self._config_file = config_file
+        # whether self._dom is shared with the dom cache and must be copied before modification
+        self._dom_shared = False
         if config_data is not None:
             self._dom = corosync_config_format.DomParser(StringIO(config_data)).dom()
         else:
@@ -424,14 +521,18 @@ class ConfParser(object):
                 self._config_file = config_file
             else:
                 self._config_file = conf()
-            try:
-                with open(self._config_file, 'r', encoding='utf-8') as f:
-                    self._dom = corosync_config_format.DomParser(f).dom()
-            except (OSError, corosync_config_format.ParserException) as e:
-                raise ValueError(str(e)) from None
+            self._dom = _load_dom(self._config_file)
+            self._dom_shared = True
 
         self._dom_query = corosync_config_format.DomQuery(self._dom)
 
+    def _ensure_mutable(self):
+        """Copy the shared dom on the first modification"""
+        if self._dom_shared:
+            self._dom = copy.deepcopy(self._dom)
+            self._dom_query = corosync_config_format.DomQuery(self._dom)
+            self._dom_shared = False
+
     def dom_query(self):
         return self._dom_query
 
@@ -439,9 +540,7 @@ class ConfParser(object):
         """save the config to config file"""
         if not config_file:
             config_file = self._config_file
-        with utils.open_atomic(config_file, 'w', fsync=True, encoding='utf-8') as f:
-            corosync_config_format.DomSerializer(self._dom, f)
-            os.fchmod(f.fileno(), file_mode)
+        _write_dom(self._dom, config_file, file_mode)
 
     def get(self, path, index=0):
         """
@@ -465,12 +564,14 @@ class ConfParser(object):
             return list()
 
     def remove(self, path, index=0):
+        self._ensure_mutable()
         try:
             self._dom_query.remove(path, index)
         except (KeyError, IndexError):
             raise ValueError("Cannot find value on path \"{}:{}\"".format(path, index)) from None
 
     def _raw_set(self, path, value, index):
+        self._ensure_mutable()
         path = path.split('.')
         node = self._dom
         path_stack = tuple()
@@ -574,14 +675,14 @@ class ConfParser(object):
                 pass
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class LinkNode:
     nodeid: int
     name: str
     addr: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Link:
     linknumber: int = -1
     nodes: list[LinkNode] = dataclasses.field(default_factory=list)
@@ -599,32 +700,35 @@ class Link:
     # ttl: typing.Optional[int] = None
 
     def load_options(self, options: dict[str, str]):
-        for field in dataclasses.fields(self):
-            if field.name == 'nodes':
+        for name, tpe in _LINK_FIELD_TYPES.items():
+            try:
+                value = options[name]
+            except KeyError:
                 continue
-            self.__load_option(options, field)
+            if value is None:
+                assert name != 'linknumber'
+            elif tpe is not str:
+                value = tpe(value)
+            setattr(self, name, value)
         return self
 
-    def __load_option(self, data: dict[str, str], field: dataclasses.Field):
-        try:
-            value = data[field.name]
-        except KeyError:
-            return
-        if value is None:
-            assert field.name not in {'linknumber', 'nodes'}
-            setattr(self, field.name, None)
-            return
-        if typing.get_origin(field.type) is typing.Union:   # Optional[A] is Union[A, NoneType]
-            match typing.get_args(field.type):
-                case type_arg, NoneType:
-                    tpe = type_arg
-                case _:
-                    assert False
-        else:
-            tpe = field.type
-        if tpe is not str:
-            value = tpe(value)
-        setattr(self, field.name, value)
+
+def _resolve_field_type(tpe) -> type:
+    if typing.get_origin(tpe) is typing.Union:   # Optional[A] is Union[A, NoneType]
+        match typing.get_args(tpe):
+            case type_arg, NoneType:
+                return type_arg
+            case _:
+                assert False
+    return tpe
+
+
+# field name -> concrete type, for the fields loadable with Link.load_options
+_LINK_FIELD_TYPES: dict[str, type] = {
+    field.name: _resolve_field_type(field.type)
+    for field in dataclasses.fields(Link)
+    if field.name != 'nodes'
+}
 
 
 class LinkManager:
@@ -641,34 +745,30 @@ class LinkManager:
         node1: int
         node2: int
 
-    LINK_OPTIONS_UPDATABLE = {
+    # keep the declaration order, which is the order the options are written into the config
+    _LINK_OPTIONS_UPDATABLE_ORDERED = tuple(
         field.name
         for field in dataclasses.fields(Link)
         if field.name not in {'linknumber', 'nodes'}
-    }
+    )
+    LINK_OPTIONS_UPDATABLE = frozenset(_LINK_OPTIONS_UPDATABLE_ORDERED)
 
     def __init__(self, config: dict):
         self._config = config
+        self._links_cache: typing.Optional[list[typing.Optional[Link]]] = None
+
+    def _invalidate_links(self):
+        self._links_cache = None
 
     @staticmethod
     def load_config_file(path=None):
-        if not path:
-            path = conf()
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                dom = corosync_config_format.DomParser(f).dom()
-                ConfParser.transform_dom_with_list_schema(dom)
-                return LinkManager(dom)
-        except (OSError, corosync_config_format.ParserException) as e:
-            raise ValueError(str(e)) from None
+        return LinkManager(load_config_dom(path))
 
     @staticmethod
     def write_config_file(dom, path=None, file_mode=0o644):
         if not path:
             path = conf()
-        with utils.open_atomic(path, 'w', fsync=True, encoding='utf-8') as f:
-            corosync_config_format.DomSerializer(dom, f)
-            os.fchmod(f.fileno(), file_mode)
+        _write_dom(dom, path, file_mode)
 
     def totem_transport(self):
         try:
@@ -679,7 +779,13 @@ class LinkManager:
     def links(self) -> list[typing.Optional[Link]]:
         """Returns a list of links, indexed by linknumber.
         The length of returned list is always KNET_LINK_NUM_LIMIT.
-        If a link with certain linknumber does not exist, the corresponding list item is None."""
+        If a link with certain linknumber does not exist, the corresponding list item is None.
+        The returned list is cached until the configuration is changed by this LinkManager."""
+        if self._links_cache is None:
+            self._links_cache = self._load_links()
+        return self._links_cache
+
+    def _load_links(self) -> list[typing.Optional[Link]]:
         assert self.totem_transport() == 'knet'
         try:
             nodelist = self._config['nodelist']['node']
@@ -690,17 +796,22 @@ class LinkManager:
         assert all('nodeid' in node for node in nodelist)
         ids = [int(node['nodeid']) for node in nodelist]
         names = self._get_node_names(nodelist)
+        # sort the nodes by nodeid once and share the order among all links
+        order = sorted(range(len(nodelist)), key=ids.__getitem__)
+        sorted_nodelist = [nodelist[j] for j in order]
+        sorted_ids = [ids[j] for j in order]
+        sorted_names = [names[j] for j in order]
         links: list[typing.Optional[Link]] = [None] * KNET_LINK_NUM_LIMIT
         for i in range(KNET_LINK_NUM_LIMIT):
             # enumerate ringX_addr for X = 0, 1, ...
             # each ringX_addr is corresponding to a link
-            if f'ring{i}_addr' not in nodelist[0]:
+            key = f'ring{i}_addr'
+            if key not in nodelist[0]:
                 continue
             # If the link exists, load the ringX_addr of all nodes on this link
-            addrs = [node[f'ring{i}_addr'] for node in nodelist]
-            assert len(addrs) == len(ids)   # both nodeid and ringX_address are required for every node
-            link_nodes = [LinkNode(*x) for x in zip(ids, names, addrs)]
-            link_nodes.sort(key=lambda node: node.nodeid)
+            # both nodeid and ringX_address are required for every node
+            addrs = [node[key] for node in sorted_nodelist]
+            link_nodes = list(map(LinkNode, sorted_ids, sorted_names, addrs))
             link = Link()
             link.linknumber = i
             link.nodes = link_nodes
@@ -716,16 +827,22 @@ class LinkManager:
             for i, link in enumerate(links)
         ]
 
-    def update_link(self, linknumber: int, options: dict[str, str|None]) -> dict:
+    def update_link(
+            self, linknumber: int, options: dict[str, str|None],
+            _links: typing.Optional[list[typing.Optional[Link]]] = None,
+    ) -> dict:
         """update link options
 
         Parameters:
             * linknumber: the link to update
             * options: specify the options to update. Not specified options will not be changed.
                        Specify None value will reset the option to its default value.
+            * _links: parsed link data to use instead of self.links(). For internal use.
         Returns: updated configuration dom. The internal state of LinkManager is also updated.
         """
-        links = self.links()
+        links = _links if _links is not None else self.links()
+        # links are going to be modified in place
+        self._invalidate_links()
         if linknumber >= KNET_LINK_NUM_LIMIT or links[linknumber] is None:
             raise ValueError(f'Link {linknumber} does not exist.')
         if 'nodes' in options:
@@ -734,7 +851,7 @@ class LinkManager:
             if option not in self.LINK_OPTIONS_UPDATABLE:
                 raise ValueError('Updating option "{}" is not supported. Updatable options: {}'.format(
                     option,
-                    ', '.join(self.LINK_OPTIONS_UPDATABLE),
+                    ', '.join(self._LINK_OPTIONS_UPDATABLE_ORDERED),
                 ))
         links[linknumber].load_options(options)
         assert 'totem' in self._config
@@ -744,18 +861,18 @@ class LinkManager:
         except KeyError:
             interfaces = list()
         linknumber_str = str(linknumber)
-        interface_index = next((i for i, x in enumerate(interfaces) if x.get('linknumber', -1) == linknumber_str), -1)
+        interface_index = self._interfaces_by_linknumber(interfaces).get(linknumber_str, -1)
         if interface_index == -1:
             interface = {'linknumber': linknumber_str}
         else:
             interface = interfaces[interface_index]
-        for k, v in dataclasses.asdict(links[linknumber]).items():
-            if k not in self.LINK_OPTIONS_UPDATABLE:
-                continue
+        link = links[linknumber]
+        for k in self._LINK_OPTIONS_UPDATABLE_ORDERED:
+            v = getattr(link, k)
             if v is None:
                 interface.pop(k, None)
             else:
-                interface[k] = str(v)
+                interface[k] = v if isinstance(v, str) else str(v)
         if len(interface) == 1:
             assert 'linknumber' in interface
             if interface_index != -1:
@@ -781,6 +898,7 @@ class LinkManager:
         links = self.links()
         if linknumber >= KNET_LINK_NUM_LIMIT or links[linknumber] is None:
             raise ValueError(f'Link {linknumber} does not exist.')
+        self._invalidate_links()
         return self.__upsert_node_addr_impl(self._config, links, linknumber, node_addresses)
 
     @staticmethod
@@ -798,27 +916,40 @@ class LinkManager:
         Returns:
             a reference to in/out arg `config`
         """
-        existing_addr_node_map = {
-            utils.IP(node.addr).ip_address: node.nodeid
-            for link in links if link is not None
-                for node in link.nodes
-            if node.addr != ''
-        }
+        canonical_addrs: dict[str, str] = dict()
+
+        def canonicalize(addr: str) -> str:
+            try:
+                return canonical_addrs[addr]
+            except KeyError:
+                ret = canonical_addrs[addr] = utils.IP(addr).ip_address
+                return ret
+
+        # built on the first address change, as no-op updates do not need it
+        existing_addr_node_map: typing.Optional[dict[str, int]] = None
+        link_nodes = {node.nodeid: node for node in links[linknumber].nodes}
         for nodeid, addr in node_addresses.items():
-            found = next((node for node in links[linknumber].nodes if node.nodeid == nodeid), None)
+            found = link_nodes.get(nodeid)
             if found is None:
                 raise ValueError(f'Unknown nodeid {nodeid}.')
-            canonical_addr = utils.IP(addr).ip_address
+            canonical_addr = canonicalize(addr)
             if (
                     found.addr == ''    # adding a new addr
-                    or utils.IP(found.addr).ip_address != canonical_addr    # updating a addr and the new value is not the same as the old value
+                    or canonicalize(found.addr) != canonical_addr    # updating a addr and the new value is not the same as the old value
             ):
                 # need to change uniqueness
+                if existing_addr_node_map is None:
+                    existing_addr_node_map = {
+                        canonicalize(node.addr): node.nodeid
+                        for link in links if link is not None
+                            for node in link.nodes
+                        if node.addr != ''
+                    }
                 existing = existing_addr_node_map.get(canonical_addr, None)
                 if existing is not None:
                     raise LinkManager.DuplicatedNodeAddressException(addr, nodeid, existing)
+                existing_addr_node_map[canonical_addr] = found.nodeid
             found.addr = addr
-            existing_addr_node_map[canonical_addr] = found.nodeid
         nodes = config['nodelist']['node']
         assert isinstance(nodes, list)
         for node in nodes:
@@ -829,6 +960,7 @@ class LinkManager:
 
     def add_link(self, node_addresses: typing.Mapping[int, str], options: dict[str, str|None]) -> dict:
         links = self.links()
+        self._invalidate_links()
         next_linknumber = next((i for i, link in enumerate(links) if link is None), -1)
         if next_linknumber == -1:
             raise ValueError(f'Cannot add a new link. The maximum number of links supported is {KNET_LINK_NUM_LIMIT}.')
@@ -838,7 +970,7 @@ class LinkManager:
             raise self.MissingNodesException(unspecified_nodes)
         links[next_linknumber] = Link(next_linknumber, [dataclasses.replace(node, addr='') for node in nodes])
         self.__upsert_node_addr_impl(self._config, links, next_linknumber, node_addresses)
-        return self.update_link(next_linknumber, options)
+        return self.update_link(next_linknumber, options, _links=links)
 
     def remove_link(self, linknumber: int) -> dict:
         """Remove the specified link.
@@ -850,8 +982,9 @@ class LinkManager:
         links = self.links()
         if linknumber >= KNET_LINK_NUM_LIMIT or links[linknumber] is None:
             raise ValueError(f'Link {linknumber} does not exist.')
-        if sum(1 if link is not None else 0 for link in links) <= 1:
+        if len(links) - links.count(None) <= 1:
             raise ValueError('Cannot remove the last link.')
+        self._invalidate_links()
         nodes = self._config['nodelist']['node']
         assert isinstance(nodes, list)
         for node in nodes:
@@ -861,10 +994,21 @@ class LinkManager:
             return self._config
         interfaces = self._config['totem']['interface']
         assert isinstance(interfaces, list)
-        interfaces = [interface for interface in interfaces if int(interface['linknumber']) != linknumber]
-        self._config['totem']['interface'] = interfaces
+        interface_index = next((i for i, x in enumerate(interfaces) if int(x['linknumber']) == linknumber), -1)
+        if interface_index != -1:
+            del interfaces[interface_index]
         return self._config
 
+    @staticmethod
+    def _interfaces_by_linknumber(interfaces: list[dict]) -> dict[str, int]:
+        """Returns a mapping of linknumber -> index of the first interface section with it"""
+        ret = dict()
+        for i, interface in enumerate(interfaces):
+            linknumber = interface.get('linknumber')
+            if linknumber is not None:
+                ret.setdefault(linknumber, i)
+        return ret
+
     @staticmethod
     def _get_node_names(nodelist: list) -> list[str]:
         ret = list()
@@ -1,4 +1,5 @@
 import argparse
+import concurrent.futures
 import dataclasses
 import enum
 import glob
@@ -38,6 +39,11 @@ SAP_HANA_RESOURCE_AGENTS = {
     cibquery.ResourceAgent('ocf', 'suse', 'SAPHanaTopology'),
 }
 
+_COROSYNC_VERSION_RE = re.compile(r"version\s+'(\d+(?:\.\d+)*)'")
+
+# cib.xml is only queried with xpath, so skip id collection, entity expansion and whitespace nodes
+_CIB_PARSER = lxml.etree.XMLParser(collect_ids=False, resolve_entities=False, remove_blank_text=True)
+
 
 class MigrationFailure(Exception):
     pass
@@ -88,13 +94,8 @@ class CheckResultJsonHandler(CheckResultHandler):
         })
 
     def end(self):
-        json.dump(
-            self.json_result,
-            sys.stdout,
-            ensure_ascii=False,
-            indent=self._indent,
-        )
-        sys.stdout.write('\n')
+        # json.dump() would issue one write per encoded chunk
+        sys.stdout.write(json.dumps(self.json_result, ensure_ascii=False, indent=self._indent) + '\n')
 
     def to_check_return_code(self) -> CheckReturnCode:
         ret = CheckReturnCode.ALREADY_MIGRATED
@@ -113,9 +114,19 @@ class CheckResultInteractiveHandler(CheckResultHandler):
         self.block_migration = False
         self.has_problems = False
         self.need_auto_fix = False
+        # isatty() is a syscall, so decide the labels once per handler
+        is_tty = sys.stdout.isatty()
+        self._info_label, self._fail_label, self._warn_label = (
+            f'{color}{text}{constants.END}' if is_tty else text
+            for color, text in (
+                (constants.GREEN, '[INFO] '),
+                (constants.YELLOW, '[FAIL] '),
+                (constants.YELLOW, '[WARN] '),
+            )
+        )
 
     def log_info(self, fmt: str, *args):
-        self.write_in_color(sys.stdout, constants.GREEN, '[INFO] ')
+        sys.stdout.write(self._info_label)
         print(fmt % args)
 
     def handle_problem(self, need_auto_fix: bool, is_blocker: bool, level:int, title: str, details: typing.Iterable[str]):
@@ -124,22 +135,16 @@ class CheckResultInteractiveHandler(CheckResultHandler):
         self.need_auto_fix = self.need_auto_fix or need_auto_fix
         match level:
             case self.LEVEL_ERROR:
-                self.write_in_color(sys.stdout, constants.YELLOW, '[FAIL] ')
+                sys.stdout.write(self._fail_label)
             case self.LEVEL_WARN:
-                self.write_in_color(sys.stdout, constants.YELLOW, '[WARN] ')
+                sys.stdout.write(self._warn_label)
         print(title)
         for line in details:
-            sys.stdout.write('       ')
-            print(line)
+            sys.stdout.write(f'       {line}\n')
 
     @staticmethod
     def write_in_color(f, color: str, text: str):
-        if f.isatty():
-            f.write(color)
-            f.write(text)
-            f.write(constants.END)
-        else:
-            f.write(text)
+        f.write(f'{color}{text}{constants.END}' if f.isatty() else text)
 
     def end(self):
         sys.stdout.write('\n')
@@ -160,8 +165,10 @@ def migrate(args: typing.Sequence[str]):
     parser = argparse.ArgumentParser(args[0])
     parser.add_argument('--local', action='store_true')
     parsed_args = parser.parse_args(args[1:])
+    # list the peers once for both the check and the copy of the migrated corosync.conf
+    remote_nodes = None if parsed_args.local else utils.list_cluster_nodes_except_me()
     try:
-        match _check_impl(local=parsed_args.local, json='', summary=False):
+        match _check_impl(local=parsed_args.local, json='', summary=False, remote_nodes=remote_nodes):
             case CheckReturnCode.ALREADY_MIGRATED:
                 logger.info("This cluster works on SLES 16. No migration is needed.")
                 return 0
@@ -170,7 +177,7 @@ def migrate(args: typing.Sequence[str]):
                 return 0
             case CheckReturnCode.PASS_NEED_AUTO_FIX:
                 logger.info('Starting migration...')
-                migrate_corosync_conf(local=parsed_args.local)
+                migrate_corosync_conf(local=parsed_args.local, remote_nodes=remote_nodes)
                 logger.info('Finished migration.')
                 return 0
             case _:
@@ -206,14 +213,12 @@ def check(args: typing.Sequence[str]) -> int:
     return ret
 
 
-def _check_impl(local: bool, json: str, summary: bool) -> CheckReturnCode:
+def _check_impl(
+        local: bool, json: str, summary: bool,
+        remote_nodes: typing.Optional[typing.Sequence[str]] = None,
+) -> CheckReturnCode:
     assert not summary or not bool(json)
     assert local or not bool(json)
-    if not local:
-        check_remote_yield = check_remote()
-        next(check_remote_yield)
-    else:
-        check_remote_yield = itertools.repeat(0)
     match json:
         case 'oneline':
             handler = CheckResultJsonHandler()
@@ -225,7 +230,7 @@ def _check_impl(local: bool, json: str, summary: bool) -> CheckReturnCode:
         check_remote_yield = itertools.repeat(0)
         check_local(handler)
     else:
-        check_remote_yield = check_remote()
+        check_remote_yield = check_remote(remote_nodes)
         next(check_remote_yield)
         print('------ node: localhost ------')
         check_local(handler)
@@ -244,9 +249,14 @@ def check_local(handler: CheckResultHandler):
     check_unsupported_corosync_features(handler)
 
 
-def check_remote():
+def check_remote(nodes: typing.Optional[typing.Sequence[str]] = None):
+    if nodes is None:
+        nodes = utils.list_cluster_nodes_except_me()
+    if not nodes:
+        yield
+        yield CheckReturnCode.ALREADY_MIGRATED
+        return
     handler = CheckResultInteractiveHandler()
-    nodes = utils.list_cluster_nodes_except_me()
     class CheckRemoteThread(threading.Thread):
         def run(self):
             self.result = prun.prun({
@@ -267,22 +277,21 @@ def check_remote():
                     str(e)
                 )
                 sys.stdout.write('\n')
-                ret = CheckReturnCode.SSH_ERROR
-            case prun.ProcessResult() as result:
+                ret = max(ret, CheckReturnCode.SSH_ERROR)
+            case prun.ProcessResult() as proc_result:
                 try:
-                    check_result = json.loads(result.stdout.decode('utf-8'))
+                    check_result = json.loads(proc_result.stdout)
                 except (UnicodeDecodeError, json.JSONDecodeError):
-                    print(result.stdout.decode('utf-8', 'backslashreplace'))
+                    print(proc_result.stdout.decode('utf-8', 'backslashreplace'))
                     handler.write_in_color(
                         sys.stderr, constants.YELLOW,
-                        result.stderr.decode('utf-8', 'backslashreplace')
+                        proc_result.stderr.decode('utf-8', 'backslashreplace')
                     )
                     sys.stdout.write('\n')
                     # cannot pass the exit status through,
                     # as all failed exit status become 1 in ui_context.Context.run()
-                    ret = CheckReturnCode.BLOCKED_NEED_MANUAL_FIX
+                    ret = max(ret, CheckReturnCode.BLOCKED_NEED_MANUAL_FIX)
                 else:
-                    handler = CheckResultInteractiveHandler()
                     problems = check_result.get("problems", list())
                     for problem in problems:
                         handler.handle_problem(
@@ -291,7 +300,7 @@ def check_remote():
                             problem.get("title", ""), problem.get("descriptions"),
                         )
                     handler.end()
-                    ret = handler.to_check_return_code()
+                    ret = max(ret, handler.to_check_return_code())
     yield ret
 
 
@@ -308,8 +317,8 @@ def check_dependency_version(handler: CheckResultHandler):
     _check_version_range(
         handler,
         'Corosync', (3,),
-        re.compile(r"version\s+'(\d+(?:\.\d+)*)'"),
-        shell.get_stdout_or_raise_error(None, 'corosync -v'),
+        _COROSYNC_VERSION_RE,
+        out,
     )
 
 
@@ -346,10 +355,7 @@ def _check_version_range(
 
 def check_unsupported_corosync_features(handler: CheckResultHandler):
     handler.log_info("Checking used corosync features...")
-    conf_path = corosync.conf()
-    with open(conf_path, 'r', encoding='utf-8') as f:
-        config = corosync_config_format.DomParser(f).dom()
-        corosync.ConfParser.transform_dom_with_list_schema(config)
+    config = corosync.load_config_dom()
     if config['totem'].get('rrp_mode', None) in {'active', 'passive'}:
         handler.handle_problem(
             True, False, handler.LEVEL_WARN,
@@ -376,11 +382,9 @@ def _check_unsupported_corosync_transport(handler: CheckResultHandler, dom):
     )
 
 
-def migrate_corosync_conf(local: bool):
+def migrate_corosync_conf(local: bool, remote_nodes: typing.Optional[typing.Sequence[str]] = None):
     conf_path = corosync.conf()
-    with open(conf_path, 'r', encoding='utf-8') as f:
-        config = corosync_config_format.DomParser(f).dom()
-        corosync.ConfParser.transform_dom_with_list_schema(config)
+    config = corosync.load_config_dom(conf_path)
     logger.info('Migrating corosync configuration...')
     migrate_corosync_conf_impl(config)
     shutil.copy(conf_path, conf_path + '.bak')
@@ -394,7 +398,7 @@ def migrate_corosync_conf(local: bool):
     if not local:
         for host, result in prun.pcopy_to_remote(
                 conf_path,
-                utils.list_cluster_nodes_except_me(), conf_path,
+                utils.list_cluster_nodes_except_me() if remote_nodes is None else remote_nodes, conf_path,
                 atomic_write=True,
         ).items():
             match result:
@@ -414,7 +418,8 @@ def migrate_corosync_conf_impl(config):
 
 
 def migrate_transport(dom):
-    match dom['totem'].get('transport', None):
+    totem = dom['totem']
+    match totem.get('transport', None):
         case 'knet':
             return
         case 'udpu':
@@ -424,7 +429,7 @@ def migrate_transport(dom):
         case _:
             # corosync 2 defaults to "udp"
             try:
-                dom['totem']['interface'][0]['bindnetaddr']
+                totem['interface'][0]['bindnetaddr']
             except KeyError:
                 # looks like a corosync 3 config
                 pass
@@ -436,34 +441,39 @@ def migrate_transport(dom):
 
 
 def migrate_udpu(dom):
-    dom['totem']['transport'] = 'knet'
-    if 'interface' in dom['totem']:
-        for interface in dom['totem']['interface']:
-            _migrate_totem_interface(interface)
+    totem = dom['totem']
+    totem['transport'] = 'knet'
+    for interface in totem.get('interface', ()):
+        _migrate_totem_interface(interface)
     if 'quorum' in dom:
         dom['quorum'].pop('expected_votes', None)
     logger.info("Upgrade totem.transport to knet.")
 
 
 def migrate_multicast(dom):
-    dom['totem']['transport'] = 'knet'
-    for interface in dom['totem']['interface']:
+    totem = dom['totem']
+    totem['transport'] = 'knet'
+    for interface in totem['interface']:
         _migrate_totem_interface(interface)
     logger.info("Generating nodelist according to CIB...")
     with open(constants.CIB_RAW_FILE, 'rb') as f:
-        cib = lxml.etree.parse(f)
+        cib = lxml.etree.parse(f, _CIB_PARSER)
     cib_nodes = cibquery.get_cluster_nodes(cib)
     assert 'nodelist' not in dom
     nodelist = list()
-    node_interfaces = {
-        x[0]: iproute2.IPAddr(json.loads(x[1][1]))
-        for x in parallax.parallax_call([x.uname for x in cib_nodes], 'ip -j addr')
-        if x[1][0] == 0
-    }
-    with tempfile.TemporaryDirectory(prefix='crmsh-migration-') as dir_name:
+    node_names = [x.uname for x in cib_nodes]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor, \
+            tempfile.TemporaryDirectory(prefix='crmsh-migration-') as dir_name:
+        # query the addresses while fetching corosync.conf from the nodes
+        ip_addr_future = executor.submit(parallax.parallax_call, node_names, 'ip -j addr')
         node_configs = {
             x[0]: x[1]
-            for x in parallax.parallax_slurp([x.uname for x in cib_nodes], dir_name, corosync.conf())
+            for x in parallax.parallax_slurp(node_names, dir_name, corosync.conf())
+        }
+        node_interfaces = {
+            x[0]: iproute2.IPAddr(json.loads(x[1][1]))
+            for x in ip_addr_future.result()
+            if x[1][0] == 0
         }
         for node in cib_nodes:
             assert node.uname in node_configs
@@ -472,12 +482,13 @@ def migrate_multicast(dom):
                 root = corosync_config_format.DomParser(f).dom()
                 corosync.ConfParser.transform_dom_with_list_schema(root)
                 interfaces = root['totem']['interface']
-                addresses = {f'ring{i}_addr': bindnetaddr_fixer.fix_bindnetaddr(x['bindnetaddr']) for i, x in enumerate(interfaces)}
+                addresses = dict()
+                for i, x in enumerate(interfaces):
+                    addresses[f'ring{i}_addr'] = bindnetaddr_fixer.fix_bindnetaddr(x['bindnetaddr'])
                 logger.info("Node %s: %s: %s", node.node_id, node.uname, addresses)
-                nodelist.append({
-                    'nodeid': node.node_id,
-                    'name': node.uname,
-                } | addresses)
+                entry = {'nodeid': node.node_id, 'name': node.uname}
+                entry.update(addresses)
+                nodelist.append(entry)
     dom['nodelist'] = {'node': nodelist}
     if 'quorum' in dom:
         dom['quorum'].pop('expected_votes', None)
@@ -485,12 +496,13 @@ def migrate_multicast(dom):
     logger.info("Upgrade totem.transport to knet.")
 
 
+_UDP_ONLY_INTERFACE_KEYS = frozenset({'mcastaddr', 'bindnetaddr', 'broadcast', 'ttl'})
+
+
 def _migrate_totem_interface(interface):
     # remove udp-only items
-    interface.pop('mcastaddr', None)
-    interface.pop('bindnetaddr', None)
-    interface.pop('broadcast', None)
-    interface.pop('ttl', None)
+    for key in _UDP_ONLY_INTERFACE_KEYS & interface.keys():
+        del interface[key]
     ringnumber = interface.pop('ringnumber', None)
     if ringnumber is not None:
         interface['linknumber'] = ringnumber
@@ -510,13 +522,11 @@ class _BindnetaddrFixer:
 
 
 def migrate_crypto(dom):
-    try:
-        # corosync 3 change the default hash algorithm to sha256 when `secauth` is enabled
-        if dom['totem'].get('crypto_hash', None) == 'sha1':
-            dom['totem']['crypto_hash'] = 'sha256'
-            logger.info('Upgrade totem.crypto_hash from "sha1" to "sha256".')
-    except KeyError:
-        dom['totem']['crypto_hash'] = 'sha256'
+    totem = dom['totem']
+    # corosync 3 change the default hash algorithm to sha256 when `secauth` is enabled
+    if totem.get('crypto_hash', None) == 'sha1':
+        totem['crypto_hash'] = 'sha256'
+        logger.info('Upgrade totem.crypto_hash from "sha1" to "sha256".')
 
 
 def migrate_rrp(dom):
@@ -527,13 +537,10 @@ def migrate_rrp(dom):
     is_rrp = any('ring1_addr' in node for node in nodes)
     if not is_rrp:
         return
-    try:
-        rrp_mode = dom['totem']['rrp_mode']
-        del dom['totem']['rrp_mode']
-        if rrp_mode == 'active':
-            dom['totem']['link_mode'] = 'active'
-    except KeyError:
-        pass
+    totem = dom['totem']
+    rrp_mode = totem.pop('rrp_mode', None)
+    if rrp_mode == 'active':
+        totem['link_mode'] = 'active'
     assert all('nodeid' in node for node in nodes)
 
 
@@ -546,7 +553,7 @@ def populate_node_name(dom):
         return
     # cannot use utils.list_cluster_nodes, as pacemaker is not running
     with open(constants.CIB_RAW_FILE, 'rb') as f:
-        cib = lxml.etree.parse(f)
+        cib = lxml.etree.parse(f, _CIB_PARSER)
     cib_nodes = {node.node_id: node for node in cibquery.get_cluster_nodes(cib)}
     for node in nodes:
         node_id = int(node['nodeid'])
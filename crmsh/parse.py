@@ -621,7 +621,8 @@ class BaseParser(object):
         This is so for example: primitive foo Dummy state=1 is accepted when
         params is the implicit initial.
         """
-        names = utils.olist(list(name_map.keys()))
+        # names is probed once per token below, t is already lower-cased
+        names = frozenset(name.lower() for name in name_map)
         oplist = utils.olist([op for op in name_map if op.lower() in ('operations', 'op')])
         for op in oplist:
             del name_map[op]
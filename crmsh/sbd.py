@@ -1492,9 +1492,10 @@ class SBDManager:
 
 
 def cleanup_existing_sbd_resource():
-    if xmlutil.CrmMonXmlParser().is_resource_configured(SBDManager.SBD_RA):
-        sbd_id_list = xmlutil.CrmMonXmlParser().get_resource_id_list_via_type(SBDManager.SBD_RA)
-        if xmlutil.CrmMonXmlParser().is_resource_started(SBDManager.SBD_RA):
+    crm_mon_xml_parser = xmlutil.CrmMonXmlParser()
+    if crm_mon_xml_parser.is_resource_configured(SBDManager.SBD_RA):
+        sbd_id_list = crm_mon_xml_parser.get_resource_id_list_via_type(SBDManager.SBD_RA)
+        if crm_mon_xml_parser.is_resource_started(SBDManager.SBD_RA):
             for sbd_id in sbd_id_list:
                 logger.info("Stop sbd resource '%s'(%s)", sbd_id, SBDManager.SBD_RA)
                 utils.ext_cmd("crm resource stop {}".format(sbd_id))
@@ -5,6 +5,10 @@ import crmsh.sh
 from crmsh import utils
 
 
+# states for which "systemctl is-active" exits with 0
+_ACTIVE_STATES = frozenset(('active', 'reloading', 'refreshing'))
+
+
 class ServiceManager(object):
     """
     Class to manage systemctl services
@@ -31,6 +35,19 @@ class ServiceManager(object):
         """
         return 0 == self._run_on_single_host("systemctl is-active '{}'".format(name), remote_addr)
 
+    def services_active(self, names: typing.Sequence[str], remote_addr=None) -> typing.List[str]:
+        """
+        Check several services with one systemctl call
+        Return the names of the active ones
+        """
+        if not names:
+            return list()
+        cmd = "systemctl is-active {}".format(' '.join("'{}'".format(name) for name in names))
+        rc, stdout, _ = self._shell.get_rc_stdout_stderr_without_input(remote_addr, cmd)
+        if rc == 255:
+            raise ValueError("Failed to run command on host {}: {}".format(remote_addr, cmd))
+        return [name for name, state in zip(names, stdout.splitlines()) if state in _ACTIVE_STATES]
+
     def start_service(self, name, enable=False, remote_addr=None, node_list=[]):
         """
         Start service
@@ -23,6 +23,7 @@ import os
 import pwd
 import re
 import shlex
+import shutil
 import socket
 import subprocess
 import sys
@@ -419,6 +420,23 @@ class ClusterShell:
 
 class ShellUtils:
     CONTROL_CHARACTER_PATTER = re.compile('[\u0000-\u001F]')
+    # words made of these characters mean the same to /bin/sh as to str.split
+    SIMPLE_COMMAND_PATTERN = re.compile(r'[\w@%+=:,./ -]+', re.ASCII)
+
+    @classmethod
+    def _simple_command_args(cls, cmd):
+        """
+        Return the argument list of cmd if it can be executed without /bin/sh,
+        that is, it has no quoting, expansion, redirection or builtin command
+        Otherwise return None
+        """
+        if not isinstance(cmd, str) or not cls.SIMPLE_COMMAND_PATTERN.fullmatch(cmd):
+            return None
+        args = cmd.split()
+        # unknown programs, builtins and variable assignments are left to the shell
+        if not args or shutil.which(args[0]) is None:
+            return None
+        return args
 
     @classmethod
     def get_stdout(cls, cmd, input_s=None, stderr_on=True, shell=True, raw=False):
@@ -454,6 +472,9 @@ class ShellUtils:
         '''
         if crmsh.options.regression_tests and not no_reg:
             print(".EXT", cmd)
+        args = cls._simple_command_args(cmd) if shell else None
+        if args is not None:
+            cmd, shell = args, False
         proc = subprocess.Popen(
             cmd,
             shell=shell,
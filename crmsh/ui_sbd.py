@@ -43,10 +43,8 @@ def sbd_configure_completer(completed_list: typing.List[str]) -> typing.List[str
     '''
     completion for sbd configure command
     '''
-    service_manager = ServiceManager()
-    pcmk_is_active = service_manager.service_is_active(constants.PCMK_SERVICE)
-    sbd_is_active = service_manager.service_is_active(constants.SBD_SERVICE)
-    if not pcmk_is_active or not sbd_is_active:
+    required_services = [constants.PCMK_SERVICE, constants.SBD_SERVICE]
+    if len(ServiceManager().services_active(required_services)) != len(required_services):
         return []
 
     is_diskbased = sbd.SBDUtils.is_using_disk_based_sbd()
@@ -1,6 +1,7 @@
 # Copyright (C) 2013 Kristoffer Gronlund <kgronlund@suse.com>
 # See COPYING for license information.
 
+import functools
 import os
 import typing
 import pwd
@@ -11,11 +12,15 @@ from . import log
 logger = log.setup_logger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _user_name(uid: int) -> str:
+    # getpwuid may go through NSS (sssd, LDAP), so look each uid up only once
+    return pwd.getpwuid(uid).pw_name
+
+
 def getuser():
     "Returns the name of the current effective user"
-    effective_uid = os.geteuid()
-    user_info = pwd.getpwuid(effective_uid)
-    return user_info.pw_name
+    return _user_name(os.geteuid())
 
 
 def get_sudoer() -> typing.Optional[str]:
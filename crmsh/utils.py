@@ -1,6 +1,7 @@
 # Copyright (C) 2008-2011 Dejan Muhamedagic <dmuhamedagic@suse.de>
 # See COPYING for license information.
 import asyncio
+import concurrent.futures
 import errno
 import os
 import sys
@@ -33,7 +34,7 @@ from stat import S_ISBLK
 from lxml import etree
 from packaging import version
 from enum import IntFlag, auto
-from functools import cache
+from functools import cache, cached_property, lru_cache
 from dataclasses import dataclass
 
 import crmsh.parallax
@@ -361,9 +362,13 @@ def multi_input(prompt=''):
     return ''.join(line)
 
 
+_BOOLEAN_TRUE_STRINGS = frozenset(("yes", "true", "on", "1"))
+_BOOLEAN_FALSE_STRINGS = frozenset(("no", "false", "off", "0"))
+
+
 def verify_boolean(opt):
-    return opt.lower() in ("yes", "true", "on", "1") or \
-        opt.lower() in ("no", "false", "off", "0")
+    opt = opt.lower()
+    return opt in _BOOLEAN_TRUE_STRINGS or opt in _BOOLEAN_FALSE_STRINGS
 
 
 def is_boolean_true(opt):
@@ -371,7 +376,7 @@ def is_boolean_true(opt):
         return False
     if opt is True:
         return True
-    return opt.lower() in ("yes", "true", "on", "1")
+    return opt.lower() in _BOOLEAN_TRUE_STRINGS
 
 
 def is_boolean_false(opt):
@@ -379,7 +384,7 @@ def is_boolean_false(opt):
         return True
     if opt is True:
         return False
-    return opt.lower() in ("no", "false", "off", "0")
+    return opt.lower() in _BOOLEAN_FALSE_STRINGS
 
 
 def get_boolean(opt, dflt=False):
@@ -1120,26 +1125,29 @@ def check_range(a):
     return int(a[0]) <= int(a[1])
 
 
+_MSEC_CONVTAB = {
+    'ms': (1, 1),
+    'msec': (1, 1),
+    'us': (1, 1000),
+    'usec': (1, 1000),
+    '': (1000, 1),
+    's': (1000, 1),
+    'sec': (1000, 1),
+    'm': (60*1000, 1),
+    'min': (60*1000, 1),
+    'h': (60*60*1000, 1),
+    'hr': (60*60*1000, 1),
+}
+_MSEC_RE = re.compile(r"\s*(\d+)\s*([a-zA-Z]+)?")
+
+
 def crm_msec(t):
     '''
     See lib/common/utils.c:crm_get_msec().
     '''
-    convtab = {
-        'ms': (1, 1),
-        'msec': (1, 1),
-        'us': (1, 1000),
-        'usec': (1, 1000),
-        '': (1000, 1),
-        's': (1000, 1),
-        'sec': (1000, 1),
-        'm': (60*1000, 1),
-        'min': (60*1000, 1),
-        'h': (60*60*1000, 1),
-        'hr': (60*60*1000, 1),
-    }
     if not t:
         return -1
-    r = re.match(r"\s*(\d+)\s*([a-zA-Z]+)?", str(t))
+    r = _MSEC_RE.match(str(t))
     if not r:
         return -1
     if not r.group(2):
@@ -1147,7 +1155,7 @@ def crm_msec(t):
     else:
         q = r.group(2).lower()
     try:
-        mult, div = convtab[q]
+        mult, div = _MSEC_CONVTAB[q]
     except KeyError:
         return -1
     return (int(r.group(1))*mult) // div
@@ -2001,6 +2009,10 @@ def detect_aws():
     return False
 
 
+# Azure encodes "MSFT AZURE VM" in the chassis asset tag as two-digit ascii codes
+_DIGIT_PAIR_RE = re.compile(r"\d\d")
+
+
 def detect_azure():
     """
     Detect if in Azure
@@ -2014,7 +2026,7 @@ def detect_azure():
     system_manufacturer = shell.get_stdout_or_raise_error("dmidecode -s system-manufacturer")
     chassis_asset_tag = shell.get_stdout_or_raise_error("dmidecode -s chassis-asset-tag")
     if "microsoft corporation" in system_manufacturer.lower() or \
-            ''.join([chr(int(n)) for n in re.findall(r"\d\d", chassis_asset_tag)]) == "MSFT AZURE VM":
+            ''.join([chr(int(n)) for n in _DIGIT_PAIR_RE.findall(chassis_asset_tag)]) == "MSFT AZURE VM":
         # To detect azure we also need to make an API request
         result = _cloud_metadata_request(
             "http://169.254.169.254/metadata/instance/network/interface/0/ipv4/ipAddress/0/privateIpAddress?api-version=2017-08-01&format=text",
@@ -2088,6 +2100,9 @@ def check_ssh_passwd_need(local_user, remote_user, host, shell: sh.LocalShell =
     return rc != 0
 
 
+_CONNECT_IN_PROGRESS_ERRNOS = frozenset((errno.EINPROGRESS, errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR))
+
+
 def check_port_open(host, port, timeout=1.0, retry=3) -> bool:
     """
     Check whether the port is open on the host
@@ -2122,6 +2137,10 @@ def check_port_open(host, port, timeout=1.0, retry=3) -> bool:
                         s.close()
                     sock.close()
                     return True
+                if err not in _CONNECT_IN_PROGRESS_ERRNOS:
+                    # refused or unreachable right away, nothing to wait for
+                    sock.close()
+                    continue
 
                 sel.register(sock, selectors.EVENT_WRITE)
                 sockets.append(sock)
@@ -2130,7 +2149,8 @@ def check_port_open(host, port, timeout=1.0, retry=3) -> bool:
                     sock.close()
 
         try:
-            events = sel.select(timeout)
+            # selecting with nothing registered would just sleep for the whole timeout
+            events = sel.select(timeout) if sockets else []
             for key, mask in events:
                 if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
                     return True
@@ -2151,18 +2171,20 @@ def valid_port(port):
     return int(port) >= 1024 and int(port) <= 65535
 
 
+# "." does not cross newlines, so each match is confined to one line of the output
+_CMAP_MEMBER_IP_RE = re.compile(r'members\.(.*)\.ip(.*)')
+_IPV4_RE = re.compile(r'[0-9]{1,3}(?:\.[0-9]{1,3}){3}')
+
+
 def get_nodeinfo_from_cmaptool():
     nodeid_ip_dict = {}
     rc, out = ShellUtils().get_stdout("corosync-cmapctl -b runtime.members")
     if rc != 0:
         return nodeid_ip_dict
 
-    for line in out.split('\n'):
-        match = re.search(r'members\.(.*)\.ip', line)
-        if match:
-            node_id = match.group(1)
-            iplist = re.findall(r'[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}', line)
-            nodeid_ip_dict[node_id] = iplist
+    for match in _CMAP_MEMBER_IP_RE.finditer(out):
+        node_id, value = match.groups()
+        nodeid_ip_dict[node_id] = _IPV4_RE.findall(value)
     return nodeid_ip_dict
 
 
@@ -2174,21 +2196,17 @@ def get_iplist_from_name(name):
     nodeid = get_nodeid_from_name(name)
     if not nodeid:
         return ip_list
-    nodeinfo = {}
     nodeinfo = get_nodeinfo_from_cmaptool()
     if not nodeinfo:
         return ip_list
-    return nodeinfo[nodeid]
+    return nodeinfo.get(nodeid, ip_list)
 
 
 def valid_nodeid(nodeid):
     if not ServiceManager().service_is_active('corosync.service'):
         return False
 
-    for _id, _ in get_nodeinfo_from_cmaptool().items():
-        if _id == nodeid:
-            return True
-    return False
+    return nodeid in get_nodeinfo_from_cmaptool()
 
 
 def get_nodeid_from_name(name):
@@ -2246,7 +2264,7 @@ class IP(object):
         """
         Check whether the address is IPV6 address
         """
-        return cls(addr).version == 6
+        return ipaddress.ip_address(addr).version == 6
 
     @property
     def is_loopback(self):
@@ -2260,15 +2278,23 @@ class IP(object):
         """
         Check whether the address is valid IP address
         """
-        cls_inst = cls(addr)
         try:
-            cls_inst.ip_address
+            ipaddress.ip_address(addr)
         except ValueError:
             return False
         else:
             return True
 
 
+@lru_cache(maxsize=4096)
+def _ip_interface(ip_with_mask):
+    """
+    Parse "ip/prefix" into an ipaddress interface; the result is immutable,
+    so it is shared between Interface instances of the same address
+    """
+    return ipaddress.ip_interface(ip_with_mask)
+
+
 class Interface(IP):
     """
     Class to get information from one interface
@@ -2293,7 +2319,7 @@ class Interface(IP):
         """
         Create ip_interface instance
         """
-        return ipaddress.ip_interface(self.ip_with_mask)
+        return _ip_interface(self.ip_with_mask)
 
     @property
     def network(self):
@@ -2307,6 +2333,8 @@ class InterfacesInfo(object):
     """
     Class to collect interfaces information on local node
     """
+    # derived from _nic_info_dict, cached until get_interfaces_info runs again
+    _CACHED_PROPERTIES = ("nic_list", "interface_list", "ip_list", "network_list")
 
     def __init__(self, ipv6: bool = False, custom_nic_addr_list: typing.List[str] = []) -> None:
         """
@@ -2329,40 +2357,44 @@ class InterfacesInfo(object):
 
         IMPORTANT: This is the method that populates the data, should always be called after initialize
         """
-        cmd = "ip -{} -o addr show".format(self.ip_version)
+        for name in self._CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+
+        cmd = "ip -j -{} addr show".format(self.ip_version)
         rc, out, err = ShellUtils().get_stdout_stderr(cmd)
         if rc != 0:
             raise ValueError(err)
 
-        # format on each line will like:
-        # 2: enp1s0    inet 192.168.122.241/24 brd 192.168.122.255 scope global enp1s0\       valid_lft forever preferred_lft forever
-        for line in out.splitlines():
-            _, nic, _, ip_with_mask, *_ = line.split()
-            # maybe from tun interface
-            if not '/' in ip_with_mask:
-                continue
-            interface_inst = Interface(ip_with_mask)
-            if interface_inst.is_loopback:
+        # each entry will like:
+        # {"ifname": "enp1s0", ..., "addr_info": [{"family": "inet", "local": "192.168.122.241", "prefixlen": 24, ...}]}
+        for entry in json.loads(out):
+            nic = entry.get("ifname")
+            # some iproute2 versions emit "{}" for links without an address of this family
+            if not nic or not entry.get("addr_info"):
                 continue
-            # one nic might configured multi IP addresses
-            if nic not in self._nic_info_dict:
-                self._nic_info_dict[nic] = []
-            self._nic_info_dict[nic].append(interface_inst)
+            for addr in entry["addr_info"]:
+                # point-to-point address from tun interface, with a peer
+                if "address" in addr:
+                    continue
+                interface_inst = Interface(f"{addr['local']}/{addr['prefixlen']}")
+                if interface_inst.is_loopback:
+                    continue
+                # one nic might configured multi IP addresses
+                if nic not in self._nic_info_dict:
+                    self._nic_info_dict[nic] = []
+                self._nic_info_dict[nic].append(interface_inst)
+                self._ip_nic_dict[interface_inst.ip] = nic
 
         if not self._nic_info_dict:
             raise ValueError("No address configured")
 
-        for nic, inst_list in self._nic_info_dict.items():
-            for inst in inst_list:
-                self._ip_nic_dict[inst.ip] = nic
-
     def flatten_custom_nic_addr_list(self) -> None:
         """
         If NIC or IP is provided by the -i option, convert them to
         nic list and address list, and do some validations
         """
         for item in self._custom_nic_addr_list:
-            if item in self.nic_list:
+            if item in self._nic_info_dict:
                 ip = self.nic_first_ip(item)
                 if ip in self._input_addr_list:
                     raise ValueError(f"Invalid input '{item}': The same NIC already used")
@@ -2377,14 +2409,14 @@ class InterfacesInfo(object):
             else:
                 raise ValueError(f"Invalid value '{item}' for -i/--interface option, should be {', '.join(self.nic_list)} or {', '.join(self.ip_list)}")
 
-    @property
+    @cached_property
     def nic_list(self):
         """
         Get interfaces name list
         """
         return list(self._nic_info_dict.keys())
 
-    @property
+    @cached_property
     def interface_list(self):
         """
         Get instance list of class Interface
@@ -2394,7 +2426,7 @@ class InterfacesInfo(object):
             _interface_list.extend(interface)
         return _interface_list
 
-    @property
+    @cached_property
     def ip_list(self):
         """
         Get IP address list
@@ -2425,18 +2457,18 @@ class InterfacesInfo(object):
         """
         cls_inst = cls(IP.is_ipv6(addr))
         cls_inst.get_interfaces_info()
-        return addr in cls_inst.ip_list
+        return addr in cls_inst._ip_nic_dict
 
     def get_nic_name_by_addr(self, addr: str) -> str:
         """
         Return NIC name by given local IP address
         Raise error if this IP is not the local address
         """
-        if addr not in self.ip_list:
+        if addr not in self._ip_nic_dict:
             raise ValueError(f"'{addr}' is not in the local address: {self.ip_list}")
         return self._ip_nic_dict[addr]
 
-    @property
+    @cached_property
     def network_list(self):
         """
         Get network list
@@ -2456,8 +2488,14 @@ class InterfacesInfo(object):
         #TODO what if user only has ipv6 route?
         cmd = "ip -o route show"
         out = sh.cluster_shell().get_stdout_or_raise_error(cmd)
-        res = re.search(r'^default via .* dev (.*?) ', out)
-        return res.group(1) if res else self.nic_list[0]
+        # format on the line will like:
+        # default via 192.168.122.1 dev eth8 proto dhcp
+        for line in out.splitlines():
+            parts = line.split()
+            if parts[:2] != ["default", "via"] or "dev" not in parts[2:-1]:
+                continue
+            return parts[parts.index("dev", 2) + 1]
+        return self.nic_list[0]
 
 
 def package_is_installed(pkg, remote_addr=None):
@@ -2486,6 +2524,24 @@ def ssh_port_reachable_check(node):
         raise ValueError(f"host \"{node}\" is unreachable via SSH")
 
 
+def _ssh_port_unreachable_nodes(node_list: list[str]) -> set[str]:
+    """
+    Run ssh_port_reachable_check on the nodes in parallel,
+    return the nodes whose SSH port is unreachable
+    """
+    unreachable = set()
+    if not node_list:
+        return unreachable
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, len(node_list))) as executor:
+        futures = {node: executor.submit(ssh_port_reachable_check, node) for node in node_list}
+        for node, future in futures.items():
+            try:
+                future.result()
+            except ValueError:
+                unreachable.add(node)
+    return unreachable
+
+
 def get_reachable_node_list(node_list:list[str]) -> list[str]:
     reachable_node_list = []
     for node in node_list:
@@ -2508,12 +2564,15 @@ def calculate_quorate_status(expected_votes=-1, actual_votes=-1):
     return int(actual_votes)/int(expected_votes) > 0.5
 
 
+_QUORUM_VOTES_RE = re.compile(r"(Expected|Total) votes:\s+(\d+)")
+
+
 def get_quorum_votes_dict(remote=None):
     """
     Return a dictionary which contain expect votes and total votes
     """
     out = sh.cluster_shell().get_stdout_or_raise_error("corosync-quorumtool -s", remote, success_exit_status={0, 2})
-    return dict(re.findall(r"(Expected|Total) votes:\s+(\d+)", out))
+    return dict(_QUORUM_VOTES_RE.findall(out))
 
 
 @dataclass
@@ -2554,25 +2613,18 @@ def check_all_nodes_reachable(
         nodes_to_check = crm_mon_inst.get_node_list(online=True, node_type="member")
         offline_nodes = crm_mon_inst.get_node_list(online=False)
 
-    dead_nodes = []
-    for node in offline_nodes:
-        try:
-            ssh_port_reachable_check(node)
-        except ValueError:
-            dead_nodes.append(node)
+    me = this_node()
+    nodes_to_check = [node for node in nodes_to_check if node != me]
+    # each check may wait for connect timeouts, so probe all nodes at once
+    unreachable = _ssh_port_unreachable_nodes(list(dict.fromkeys(offline_nodes + nodes_to_check)))
+    dead_nodes = [node for node in offline_nodes if node in unreachable]
 
     nodes_unreachable = []
     nodes_need_password = []
     reachable_nodes = []
-    me = this_node()
 
     for node in nodes_to_check:
-        if node == me:
-            continue
-
-        try:
-            ssh_port_reachable_check(node)
-        except ValueError:
+        if node in unreachable:
             nodes_unreachable.append(node)
             continue
 
@@ -2618,6 +2670,9 @@ def re_split_string(reg, string):
     """
     Split a string by a regrex, filter out empty items
     """
+    if reg == "[; ]":
+        # the device list separator, no regex engine needed for it
+        return [x for x in string.replace(";", " ").split(" ") if x]
     return [x for x in re.split(reg, string) if x]
 
 
@@ -2626,10 +2681,10 @@ def is_block_device(dev):
     Check if dev is a block device
     """
     try:
-        rc = S_ISBLK(os.stat(dev).st_mode)
+        mode = os.stat(dev).st_mode
     except OSError:
         return False
-    return rc
+    return S_ISBLK(mode)
 
 
 def detect_duplicate_device_path(device_list: typing.List[str]):
@@ -2684,8 +2739,7 @@ def randomword(length=6):
     """
     Generate random word
     """
-    letters = string.ascii_lowercase
-    return ''.join(random.choice(letters) for i in range(length))
+    return ''.join(random.choices(string.ascii_lowercase, k=length))
 
 
 def gen_unused_id(exist_id_list, prefix="", length=6):
@@ -2698,12 +2752,16 @@ def gen_unused_id(exist_id_list, prefix="", length=6):
     return unused_id
 
 
+_VG_NAME_RE = re.compile(r"VG Name\s+(.*)")
+_TOTAL_PE_RE = re.compile(r"Total PE\s+(\d+)")
+
+
 def get_all_vg_name():
     """
     Get all available VGs
     """
     out = sh.cluster_shell().get_stdout_or_raise_error("vgdisplay")
-    return re.findall(r"VG Name\s+(.*)", out)
+    return _VG_NAME_RE.findall(out)
 
 
 def get_pe_number(vg_id):
@@ -2711,7 +2769,7 @@ def get_pe_number(vg_id):
     Get pe number
     """
     output = sh.cluster_shell().get_stdout_or_raise_error("vgdisplay {}".format(vg_id))
-    res = re.search(r"Total PE\s+(\d+)", output)
+    res = _TOTAL_PE_RE.search(output)
     if not res:
         raise ValueError("Cannot find PE on VG({})".format(vg_id))
     return int(res.group(1))
@@ -2821,12 +2879,15 @@ def fatal(error_msg):
     raise ValueError(error_msg)
 
 
+_DLM_OPTION_RE = re.compile(r"(\w+)=(\w+)")
+
+
 def get_dlm_option_dict(peer=None):
     """
     Get dlm config option dictionary
     """
     out = sh.cluster_shell().get_stdout_or_raise_error("dlm_tool dump_config", peer)
-    return dict(re.findall(r"(\w+)=(\w+)", out))
+    return dict(_DLM_OPTION_RE.findall(out))
 
 
 def set_dlm_option(peer=None, **kargs):
@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 import crm_script
 try:
-    uptime = open('/proc/uptime').read().split()[0]
-    crm_script.exit_ok(uptime)
-except Exception as e:
+    with open('/proc/uptime') as f:
+        uptime = f.readline().split(' ', 1)[0]
+except OSError as e:
     crm_script.exit_fail("Couldn't open /proc/uptime: %s" % (e))
+crm_script.exit_ok(uptime)
@@ -535,9 +535,10 @@ class TestBootstrap(unittest.TestCase):
         Global tearDown.
         """
 
+    @mock.patch('time.sleep')
     @mock.patch('crmsh.service_manager.ServiceManager.start_service')
     @mock.patch('crmsh.sbd.SBDManager.unset_sbd_delay_start')
-    def test_start_pacemaker(self, mock_unset_delay_start,  mock_start):
+    def test_start_pacemaker(self, mock_unset_delay_start,  mock_start, mock_sleep):
         bootstrap._context = None
         node_list = ["node1", "node2", "node3", "node4", "node5", "node6"]
         bootstrap.start_pacemaker(node_list)
@@ -1973,17 +1974,13 @@ class TestValidation(unittest.TestCase):
     @mock.patch('crmsh.utils.this_node')
     @mock.patch('crmsh.service_manager.ServiceManager.stop_service')
     @mock.patch('logging.Logger.info')
-    @mock.patch('crmsh.service_manager.ServiceManager.service_is_active')
+    @mock.patch('crmsh.service_manager.ServiceManager.services_active')
     def test_stop_and_disable_services(self, mock_active, mock_status, mock_stop, mock_this_node, mock_enabled, mock_disable):
-        mock_active.side_effect = [True, True, True, True]
+        mock_active.return_value = ["corosync-qdevice.service", "corosync.service", "hawk.service"]
         mock_enabled.side_effect = [True, True]
         mock_this_node.side_effect = ['node1', 'node1', 'node1', 'node1', 'node1', 'node1']
         bootstrap.stop_and_disable_services()
-        mock_active.assert_has_calls([
-            mock.call("corosync-qdevice.service", remote_addr=None),
-            mock.call("corosync.service", remote_addr=None),
-            mock.call("hawk.service", remote_addr=None),
-            ])
+        mock_active.assert_called_once_with(bootstrap.SERVICES_STOP_LIST, remote_addr=None)
         mock_status.assert_has_calls([
             mock.call('Stopping and disable %s on node %s', 'corosync-qdevice.service', 'node1'),
             mock.call('Stopping and disable %s on node %s', 'corosync.service', 'node1'),
@@ -112,3 +112,11 @@ class TestCibQuery(unittest.TestCase):
     def test_get_node_name_by_id(self):
         self.assertEqual(cibquery.get_node_name_by_id(self.cib, 1), "ha-1-1")
         self.assertIsNone(cibquery.get_node_name_by_id(self.cib, 2))
+
+    def test_get_parameter_value(self):
+        self.assertEqual(cibquery.get_parameter_value(self.cib, 'admin-ip', 'ip'), '192.168.122.17')
+        self.assertIsNone(cibquery.get_parameter_value(self.cib, 'admin-ip', 'foo'))
+        self.assertIsNone(cibquery.get_parameter_value(self.cib, 'foo"]|//*[@id="admin-ip', 'ip'))
+
+    def test_get_cluster_nodes(self):
+        self.assertListEqual([cibquery.ClusterNode(1, 'ha-1-1')], cibquery.get_cluster_nodes(self.cib))
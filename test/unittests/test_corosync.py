@@ -4,6 +4,8 @@
 # unit tests for parse.py
 
 import copy
+import os
+import tempfile
 import unittest
 import pytest
 from unittest import mock
@@ -201,11 +203,32 @@ def test_token_and_consensus_timeout(mock_get_dict):
     assert corosync.token_and_consensus_timeout() == 22
 
 
-@mock.patch('crmsh.corosync.get_corosync_value')
-def test_get_corosync_value_dict(mock_get_value):
-    mock_get_value.side_effect = ["10000", None]
+@mock.patch('crmsh.corosync.get_corosync_values')
+def test_get_corosync_value_dict(mock_get_values):
+    mock_get_values.return_value = {"totem.token": "10000", "totem.consensus": None}
     res = corosync.get_corosync_value_dict()
     assert res == {"token": 10, "consensus": 12}
+    mock_get_values.assert_called_once_with(("totem.token", "totem.consensus"))
+
+
+@mock.patch('crmsh.sh.ClusterShell.get_stdout_or_raise_error')
+def test_get_corosync_values(mock_run):
+    mock_run.return_value = """runtime.config.totem.consensus (u32) = 3600
+runtime.config.totem.token (u32) = 3000
+runtime.config.totem.token_retransmit (u32) = 714"""
+    res = corosync.get_corosync_values(("totem.token", "totem.consensus", "totem.join"))
+    assert res == {"totem.token": "3000", "totem.consensus": "3600", "totem.join": None}
+    mock_run.assert_called_once_with("corosync-cmapctl runtime.config.totem.")
+
+
+@mock.patch('crmsh.corosync.get_value')
+@mock.patch('crmsh.sh.ClusterShell.get_stdout_or_raise_error')
+def test_get_corosync_values_raise(mock_run, mock_get_value):
+    mock_run.side_effect = ValueError
+    mock_get_value.side_effect = ["3000", None]
+    res = corosync.get_corosync_values(("totem.token", "totem.consensus"))
+    assert res == {"totem.token": "3000", "totem.consensus": None}
+    mock_get_value.assert_has_calls([mock.call("totem.token"), mock.call("totem.consensus")])
 
 
 @mock.patch('crmsh.corosync.get_value')
@@ -225,6 +248,55 @@ def test_get_corosync_value(mock_run):
     mock_run.assert_called_once_with("corosync-cmapctl runtime.config.totem.token")
 
 
+@mock.patch('crmsh.utils.this_node')
+@mock.patch('crmsh.utils.ext_cmd_nosudo')
+@mock.patch('crmsh.tmpfiles.create')
+@mock.patch('crmsh.corosync.conf')
+def test_pull_configuration(mock_conf, mock_create, mock_ext_cmd, mock_this_node, tmp_path):
+    local_path = tmp_path / 'corosync.conf'
+    fetched_path = tmp_path / 'fetched'
+    local_path.write_text('totem {\n}\n')
+    fetched_path.write_text('totem {\n}\n')
+    mock_conf.return_value = str(local_path)
+    mock_create.return_value = (None, str(fetched_path))
+    mock_ext_cmd.return_value = 0
+    mock_this_node.return_value = 'node1'
+
+    corosync.pull_configuration('node2')
+    assert local_path.read_text() == 'totem {\n}\n'
+
+    fetched_path.write_text('quorum {\n}\n')
+    corosync.pull_configuration('node2')
+    assert local_path.read_text() == 'quorum {\n}\n'
+
+
+@pytest.mark.parametrize("ids, expected", [
+    ([], 1),
+    (['1', '2', '3'], 4),
+    (['3', '1', '4'], 2),
+])
+@mock.patch('crmsh.corosync.get_values')
+def test_get_free_nodeid(mock_get_values, ids, expected):
+    mock_get_values.return_value = ids
+    assert corosync.get_free_nodeid() == expected
+    mock_get_values.assert_called_once_with('nodelist.node.nodeid')
+
+
+@mock.patch('crmsh.utils.InterfacesInfo.get_local_ip_list')
+@mock.patch('crmsh.corosync.ConfParser')
+def test_find_configured_ip(mock_parser, mock_get_local_ip_list):
+    mock_parser.return_value.get_all.return_value = [
+        {'nodeid': '1', 'ring0_addr': '10.10.10.1', 'ring1_addr': '10.10.20.1'},
+        {'nodeid': '2', 'ring0_addr': '10.10.10.2', 'ring1_addr': '10.10.20.2'},
+    ]
+    mock_get_local_ip_list.return_value = ['10.10.10.3', '10.10.20.2']
+    corosync.find_configured_ip(['10.10.10.4'])
+    with pytest.raises(corosync.IPAlreadyConfiguredError) as err:
+        corosync.find_configured_ip(['10.10.10.3'])
+    assert str(err.value) == "IP 10.10.20.2 was already configured"
+    mock_parser.return_value.get_all.assert_called_with("nodelist.node")
+
+
 class TestConfigParserSet(unittest.TestCase):
     def setUp(self) -> None:
         self.inst = corosync.ConfParser(config_data='')
@@ -253,6 +325,74 @@ class TestConfigParserSet(unittest.TestCase):
             self.inst._raw_set('totem.interface.foo', 0, 3)
 
 
+class TestLoadDom(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'corosync.conf')
+        with open(self.path, 'w') as f:
+            f.write('totem {\n    token: 3000\n}\n')
+
+    def tearDown(self) -> None:
+        corosync._invalidate_dom(self.path)
+        self.tmpdir.cleanup()
+
+    @mock.patch('crmsh.corosync_config_format.DomParser')
+    def test_cached(self, mock_parser):
+        mock_parser.return_value.dom.return_value = {'totem': {'token': '3000'}}
+        self.assertEqual('3000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+        self.assertEqual('3000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+        mock_parser.assert_called_once()
+
+    def test_reload_on_change(self):
+        self.assertEqual('3000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+        with open(self.path, 'w') as f:
+            f.write('totem {\n    token: 10000\n}\n')
+        self.assertEqual('10000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+
+    def test_invalidate_on_save(self):
+        inst = corosync.ConfParser(config_file=self.path)
+        inst.set('totem.token', '5000')
+        self.assertEqual('3000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+        inst.save()
+        self.assertNotIn(self.path, corosync._CONF_CACHE)
+        self.assertEqual('5000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+
+    def test_copy_on_write(self):
+        inst1 = corosync.ConfParser(config_file=self.path)
+        inst2 = corosync.ConfParser(config_file=self.path)
+        self.assertIs(inst1._dom, inst2._dom)
+        inst1.set('totem.token', '5000')
+        self.assertIsNot(inst1._dom, inst2._dom)
+        self.assertEqual('5000', inst1.get('totem.token'))
+        self.assertEqual('3000', inst2.get('totem.token'))
+        inst2.remove('totem.token')
+        self.assertIsNone(inst2.get('totem.token'))
+        self.assertEqual('3000', corosync.ConfParser(config_file=self.path).get('totem.token'))
+
+    def test_file_not_found(self):
+        with self.assertRaises(ValueError):
+            corosync.ConfParser(config_file=os.path.join(self.tmpdir.name, 'nonexist'))
+
+    @mock.patch('crmsh.corosync.logger.error')
+    @mock.patch('crmsh.sh.cluster_shell')
+    def test_is_valid_corosync_conf_cached(self, mock_cluster_shell, mock_error):
+        mock_run = mock_cluster_shell.return_value.get_stdout_or_raise_error
+        self.assertTrue(corosync.is_valid_corosync_conf(self.path))
+        self.assertTrue(corosync.is_valid_corosync_conf(self.path))
+        mock_run.assert_called_once_with(f"corosync -c {self.path} -t")
+
+        with open(self.path, 'w') as f:
+            f.write('totem {\n    token: 10000\n}\n')
+        mock_run.side_effect = ValueError('invalid')
+        self.assertFalse(corosync.is_valid_corosync_conf(self.path))
+        self.assertFalse(corosync.is_valid_corosync_conf(self.path))
+        self.assertEqual(2, mock_run.call_count)
+        mock_error.assert_has_calls([
+            mock.call("Invalid %s: %s", self.path, 'invalid'),
+            mock.call("Invalid %s: %s", self.path, 'invalid'),
+        ])
+
+
 class TestLinkLoadOptions(unittest.TestCase):
     def test_load_int(self):
         link = corosync.Link()
@@ -394,6 +534,14 @@ class TestLinkManagerUpdateLink(unittest.TestCase):
     def setUp(self):
         self.lm = corosync.LinkManager(copy.deepcopy(self.ORIGINAL))
 
+    def test_links_cached_until_updated(self):
+        links = self.lm.links()
+        self.assertIs(links, self.lm.links())
+        self.lm.update_link(0, {'knet_link_priority': '2'})
+        links = self.lm.links()
+        self.assertEqual(2, links[0].knet_link_priority)
+        self.assertIs(links, self.lm.links())
+
     def test_update_and_add_new_option(self):
         dom = self.lm.update_link(0, {'knet_transport': 'sctp', 'knet_link_priority': '2'})
         self.assertEqual(2, len(dom['totem']['interface']))
@@ -114,3 +114,117 @@ class TestCheckRemovedResourceAgents(unittest.TestCase):
                 'Please run "crm configure upgrade force" to upgrade to the latest version.',
             ]
         )
+
+
+class TestCheckRemote(unittest.TestCase):
+    @mock.patch('sys.stdout')
+    @mock.patch('crmsh.prun.prun.prun')
+    @mock.patch('crmsh.utils.list_cluster_nodes_except_me')
+    def test_check_remote_accumulates_hosts(self, mock_list_nodes, mock_prun, mock_stdout):
+        mock_stdout.isatty.return_value = False
+        mock_list_nodes.return_value = ['node2', 'node3']
+        mock_prun.return_value = {
+            'node2': migration.prun.ProcessResult(
+                0,
+                b'{"problems": [{"need_auto_fix": false, "is_blocker": true, "level": 1, "title": "foo", "descriptions": []}]}',
+                b'',
+            ),
+            'node3': migration.prun.ProcessResult(0, b'{"problems": []}', b''),
+        }
+        check_remote = migration.check_remote()
+        next(check_remote)
+        self.assertEqual(migration.CheckReturnCode.BLOCKED_NEED_MANUAL_FIX, next(check_remote))
+
+    @mock.patch('crmsh.prun.prun.prun')
+    @mock.patch('crmsh.utils.list_cluster_nodes_except_me')
+    def test_check_remote_without_other_nodes(self, mock_list_nodes, mock_prun):
+        mock_list_nodes.return_value = []
+        check_remote = migration.check_remote()
+        next(check_remote)
+        self.assertEqual(migration.CheckReturnCode.ALREADY_MIGRATED, next(check_remote))
+        mock_prun.assert_not_called()
+
+
+class TestCheckResultInteractiveHandler(unittest.TestCase):
+    @mock.patch('sys.stdout')
+    def test_handle_problem_tty(self, mock_stdout):
+        mock_stdout.isatty.return_value = True
+        handler = migration.CheckResultInteractiveHandler()
+        handler.handle_problem(False, True, handler.LEVEL_ERROR, 'foo', ['bar', 'baz'])
+        mock_stdout.write.assert_has_calls([
+            mock.call(f'{migration.constants.YELLOW}[FAIL] {migration.constants.END}'),
+            mock.call('foo'),
+            mock.call('\n'),
+            mock.call('       bar\n'),
+            mock.call('       baz\n'),
+        ])
+        self.assertTrue(handler.block_migration)
+
+    @mock.patch('sys.stdout')
+    def test_write_in_color_not_tty(self, mock_stdout):
+        mock_stdout.isatty.return_value = False
+        migration.CheckResultInteractiveHandler.write_in_color(mock_stdout, migration.constants.GREEN, '[INFO] ')
+        mock_stdout.write.assert_called_once_with('[INFO] ')
+
+    @mock.patch('sys.stdout')
+    def test_log_info_not_tty(self, mock_stdout):
+        mock_stdout.isatty.return_value = False
+        handler = migration.CheckResultInteractiveHandler()
+        handler.log_info('%s', 'foo')
+        handler.log_info('%s', 'bar')
+        mock_stdout.isatty.assert_called_once_with()
+        mock_stdout.write.assert_has_calls([mock.call('[INFO] '), mock.call('foo'), mock.call('\n')])
+
+
+class TestMigrateCorosyncConf(unittest.TestCase):
+    def test_migrate_udpu_rrp(self):
+        config = {
+            'totem': {
+                'transport': 'udpu',
+                'crypto_hash': 'sha1',
+                'rrp_mode': 'active',
+                'interface': [
+                    {'ringnumber': '0', 'bindnetaddr': '192.168.1.0', 'mcastport': '5405', 'ttl': '1'},
+                    {'ringnumber': '1', 'bindnetaddr': '192.168.2.0', 'mcastport': '5407', 'ttl': '1'},
+                ],
+            },
+            'nodelist': {'node': [
+                {'nodeid': '1', 'name': 'node1', 'ring0_addr': '192.168.1.1', 'ring1_addr': '192.168.2.1'},
+            ]},
+            'quorum': {'provider': 'corosync_votequorum', 'expected_votes': '2'},
+        }
+        migration.migrate_corosync_conf_impl(config)
+        self.assertDictEqual({
+            'transport': 'knet',
+            'crypto_hash': 'sha256',
+            'link_mode': 'active',
+            'interface': [
+                {'mcastport': '5405', 'linknumber': '0'},
+                {'mcastport': '5407', 'linknumber': '1'},
+            ],
+        }, config['totem'])
+        self.assertDictEqual({'provider': 'corosync_votequorum'}, config['quorum'])
+
+
+class TestMigrate(unittest.TestCase):
+    @mock.patch('crmsh.migration.migrate_corosync_conf')
+    @mock.patch('crmsh.migration._check_impl')
+    @mock.patch('crmsh.utils.list_cluster_nodes_except_me')
+    def test_migrate_lists_nodes_once(self, mock_list_nodes, mock_check_impl, mock_migrate_corosync_conf):
+        mock_list_nodes.return_value = ['node2']
+        mock_check_impl.return_value = migration.CheckReturnCode.PASS_NEED_AUTO_FIX
+        self.assertEqual(0, migration.migrate(['sles16']))
+        mock_list_nodes.assert_called_once_with()
+        mock_check_impl.assert_called_once_with(local=False, json='', summary=False, remote_nodes=['node2'])
+        mock_migrate_corosync_conf.assert_called_once_with(local=False, remote_nodes=['node2'])
+
+
+class TestCheckResultJsonHandler(unittest.TestCase):
+    @mock.patch('sys.stdout')
+    def test_end(self, mock_stdout):
+        handler = migration.CheckResultJsonHandler()
+        handler.handle_problem(False, True, handler.LEVEL_ERROR, 'foo', iter(['bar']))
+        handler.end()
+        mock_stdout.write.assert_called_once_with(
+            '{"problems": [{"need_auto_fix": false, "is_blocker": true, "level": 1, "title": "foo", "descriptions": ["bar"]}]}\n'
+        )
@@ -53,6 +53,28 @@ class TestServiceManager(unittest.TestCase):
             self.service_manager._run_on_single_host('foo', 'node1')
         self.service_manager._shell.get_rc_stdout_stderr_without_input.assert_called_once_with('node1', 'foo')
 
+    def test_services_active(self, mock_call_with_parallax: mock.MagicMock):
+        self.service_manager = ServiceManager(mock.Mock(crmsh.sh.ClusterShell))
+        self.service_manager._shell.get_rc_stdout_stderr_without_input.return_value = (3, 'active\ninactive\nactive', '')
+        self.assertEqual(['s1', 's3'], self.service_manager.services_active(['s1', 's2', 's3'], 'node1'))
+        self.service_manager._shell.get_rc_stdout_stderr_without_input.assert_called_once_with(
+            'node1', "systemctl is-active 's1' 's2' 's3'",
+        )
+
+    def test_services_active_reloading(self, mock_call_with_parallax: mock.MagicMock):
+        self.service_manager = ServiceManager(mock.Mock(crmsh.sh.ClusterShell))
+        self.service_manager._shell.get_rc_stdout_stderr_without_input.return_value = (3, 'reloading\nrefreshing\nfailed', '')
+        self.assertEqual(['s1', 's2'], self.service_manager.services_active(['s1', 's2', 's3']))
+        self.service_manager._shell.get_rc_stdout_stderr_without_input.assert_called_once_with(
+            None, "systemctl is-active 's1' 's2' 's3'",
+        )
+
+    def test_services_active_return_255(self, mock_call_with_parallax: mock.MagicMock):
+        self.service_manager = ServiceManager(mock.Mock(crmsh.sh.ClusterShell))
+        self.service_manager._shell.get_rc_stdout_stderr_without_input.return_value = (255, '', 'err')
+        with self.assertRaises(ValueError):
+            self.service_manager.services_active(['s1'], 'node1')
+
     def test_start_service(self, mock_call_with_parallax: mock.MagicMock):
         self.service_manager._call.return_value = ['node1']
         self.assertEqual(['node1'], self.service_manager.start_service('service1', remote_addr='node1'))
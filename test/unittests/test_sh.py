@@ -230,3 +230,46 @@ class TestCommandFailurePickling(unittest.TestCase):
         self.assertEqual(original.host, unpickled.host)
         self.assertEqual(original.user, unpickled.user)
         self.assertEqual(original.msg, unpickled.msg)
+
+
+class TestShellUtils(unittest.TestCase):
+    @mock.patch('shutil.which')
+    def test_simple_command_args(self, mock_which: mock.MagicMock):
+        mock_which.return_value = '/usr/bin/crm_mon'
+        self.assertEqual(crmsh.sh.ShellUtils._simple_command_args('crm_mon -1 --output-as=xml'), ['crm_mon', '-1', '--output-as=xml'])
+        mock_which.assert_called_once_with('crm_mon')
+
+    @mock.patch('shutil.which')
+    def test_simple_command_args_needs_shell(self, mock_which: mock.MagicMock):
+        mock_which.return_value = '/usr/bin/ls'
+        for cmd in ["ls | wc -l", "ls 'a b'", "ls $HOME", "ls ~", "ls *.xml", "ls > out", "ls && true", "ls\nls", ""]:
+            self.assertIsNone(crmsh.sh.ShellUtils._simple_command_args(cmd), cmd)
+        mock_which.assert_not_called()
+
+    @mock.patch('shutil.which')
+    def test_simple_command_args_not_a_program(self, mock_which: mock.MagicMock):
+        mock_which.return_value = None
+        self.assertIsNone(crmsh.sh.ShellUtils._simple_command_args('command -v crm'))
+        mock_which.assert_called_once_with('command')
+
+    @mock.patch('subprocess.Popen')
+    def test_get_stdout_stderr_without_shell(self, mock_popen: mock.MagicMock):
+        mock_popen.return_value.communicate.return_value = (b'out\n', b'')
+        mock_popen.return_value.returncode = 0
+        with mock.patch('shutil.which', return_value='/usr/bin/dlm_tool'):
+            rc, out, err = crmsh.sh.ShellUtils().get_stdout_stderr('dlm_tool dump_config')
+        self.assertEqual((rc, out, err), (0, 'out', ''))
+        mock_popen.assert_called_once_with(
+            ['dlm_tool', 'dump_config'],
+            shell=False,
+            stdin=None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=os.environ,
+        )
+
+    def test_get_stdout_stderr_runs_real_commands(self):
+        self.assertEqual(crmsh.sh.ShellUtils().get_stdout_stderr('echo a b'), (0, 'a b', ''))
+        self.assertEqual(crmsh.sh.ShellUtils().get_stdout_stderr('echo "a  b" | cat'), (0, 'a  b', ''))
+        rc, _, _ = crmsh.sh.ShellUtils().get_stdout_stderr('no-such-program-for-crmsh')
+        self.assertEqual(rc, 127)
@@ -56,6 +56,7 @@ class TestCluster(unittest.TestCase):
             mock.call("The cluster stack already started on node2")
             ])
 
+    @mock.patch('time.sleep')
     @mock.patch('crmsh.bootstrap.get_failed_services')
     @mock.patch('crmsh.qdevice.QDevice.check_qdevice_vote')
     @mock.patch('crmsh.bootstrap.start_pacemaker')
@@ -65,7 +66,7 @@ class TestCluster(unittest.TestCase):
     @mock.patch('crmsh.service_manager.ServiceManager.start_service')
     @mock.patch('crmsh.service_manager.ServiceManager.service_is_active')
     @mock.patch('crmsh.ui_utils.parse_and_validate_node_args')
-    def test_do_start(self, mock_parse_nodes, mock_active, mock_start, mock_qdevice_configured, mock_info, mock_error, mock_start_pacemaker, mock_check_qdevice, mock_get_failed_services):
+    def test_do_start(self, mock_parse_nodes, mock_active, mock_start, mock_qdevice_configured, mock_info, mock_error, mock_start_pacemaker, mock_check_qdevice, mock_get_failed_services, mock_sleep):
         context_inst = mock.Mock()
         mock_start_pacemaker.return_value = ["node1"]
         mock_parse_nodes.return_value = ["node1", "node2"], False
@@ -47,25 +47,31 @@ class TestOutterFunctions(unittest.TestCase):
 
     @mock.patch('crmsh.ui_sbd.ServiceManager')
     def test_sbd_configure_completer_return(self, mock_ServiceManager):
-        mock_ServiceManager.return_value.service_is_active.side_effect = [True, False]
+        mock_ServiceManager.return_value.services_active.return_value = [constants.PCMK_SERVICE]
         self.assertEqual(ui_sbd.sbd_configure_completer([]), [])
-        mock_ServiceManager.return_value.service_is_active.assert_has_calls([
-            mock.call(constants.PCMK_SERVICE),
-            mock.call(constants.SBD_SERVICE)
-        ])
+        mock_ServiceManager.return_value.services_active.assert_called_once_with([constants.PCMK_SERVICE, constants.SBD_SERVICE])
+
+    @mock.patch('crmsh.sbd.SBDUtils.is_using_diskless_sbd')
+    @mock.patch('crmsh.sbd.SBDUtils.is_using_disk_based_sbd')
+    @mock.patch('crmsh.sh.cluster_shell')
+    def test_sbd_configure_completer_services_reloading(self, mock_cluster_shell, mock_is_using_disk_based_sbd, mock_is_using_diskless_sbd):
+        mock_cluster_shell.return_value.get_rc_stdout_stderr_without_input.return_value = (0, "active\nreloading", "")
+        mock_is_using_disk_based_sbd.return_value = True
+        mock_is_using_diskless_sbd.return_value = False
+        self.assertEqual(ui_sbd.sbd_configure_completer(["configure", "show", ""]), list(ui_sbd.SBD.SHOW_TYPES))
+        mock_cluster_shell.return_value.get_rc_stdout_stderr_without_input.assert_called_once_with(
+            None, f"systemctl is-active '{constants.PCMK_SERVICE}' '{constants.SBD_SERVICE}'"
+        )
 
     @mock.patch('crmsh.sbd.SBDUtils.is_using_diskless_sbd')
     @mock.patch('crmsh.sbd.SBDUtils.is_using_disk_based_sbd')
     @mock.patch('crmsh.ui_sbd.ServiceManager')
     def test_sbd_configure_completer_show_return(self, mock_ServiceManager, mock_is_using_disk_based_sbd, mock_is_using_diskless_sbd):
-        mock_ServiceManager.return_value.service_is_active.side_effect = [True, True]
+        mock_ServiceManager.return_value.services_active.return_value = [constants.PCMK_SERVICE, constants.SBD_SERVICE]
         mock_is_using_disk_based_sbd.return_value = True
         mock_is_using_diskless_sbd.return_value = False
         self.assertEqual(ui_sbd.sbd_configure_completer(["configure", "show", ""]), list(ui_sbd.SBD.SHOW_TYPES))
-        mock_ServiceManager.return_value.service_is_active.assert_has_calls([
-            mock.call(constants.PCMK_SERVICE),
-            mock.call(constants.SBD_SERVICE)
-        ])
+        mock_ServiceManager.return_value.services_active.assert_called_once_with([constants.PCMK_SERVICE, constants.SBD_SERVICE])
         mock_is_using_disk_based_sbd.assert_called_once()
         mock_is_using_diskless_sbd.assert_called_once()
 
@@ -73,14 +79,11 @@ class TestOutterFunctions(unittest.TestCase):
     @mock.patch('crmsh.sbd.SBDUtils.is_using_disk_based_sbd')
     @mock.patch('crmsh.ui_sbd.ServiceManager')
     def test_sbd_configure_completer_show_return_empty(self, mock_ServiceManager, mock_is_using_disk_based_sbd, mock_is_using_diskless_sbd):
-        mock_ServiceManager.return_value.service_is_active.side_effect = [True, True]
+        mock_ServiceManager.return_value.services_active.return_value = [constants.PCMK_SERVICE, constants.SBD_SERVICE]
         mock_is_using_disk_based_sbd.return_value = True
         mock_is_using_diskless_sbd.return_value = False
         self.assertEqual(ui_sbd.sbd_configure_completer(["configure", "show", "xx", ""]), [])
-        mock_ServiceManager.return_value.service_is_active.assert_has_calls([
-            mock.call(constants.PCMK_SERVICE),
-            mock.call(constants.SBD_SERVICE)
-        ])
+        mock_ServiceManager.return_value.services_active.assert_called_once_with([constants.PCMK_SERVICE, constants.SBD_SERVICE])
         mock_is_using_disk_based_sbd.assert_called_once()
         mock_is_using_diskless_sbd.assert_called_once()
 
@@ -88,14 +91,11 @@ class TestOutterFunctions(unittest.TestCase):
     @mock.patch('crmsh.sbd.SBDUtils.is_using_disk_based_sbd')
     @mock.patch('crmsh.ui_sbd.ServiceManager')
     def test_sbd_configure_completer_success(self, mock_ServiceManager, mock_is_using_disk_based_sbd, mock_is_using_diskless_sbd):
-        mock_ServiceManager.return_value.service_is_active.side_effect = [True, True]
+        mock_ServiceManager.return_value.services_active.return_value = [constants.PCMK_SERVICE, constants.SBD_SERVICE]
         mock_is_using_disk_based_sbd.return_value = False
         mock_is_using_diskless_sbd.return_value = True
         self.assertEqual(ui_sbd.sbd_configure_completer(["configure", ""]), ["show", "watchdog-timeout=", "crashdump-watchdog-timeout=", "watchdog-device="])
-        mock_ServiceManager.return_value.service_is_active.assert_has_calls([
-            mock.call(constants.PCMK_SERVICE),
-            mock.call(constants.SBD_SERVICE)
-        ])
+        mock_ServiceManager.return_value.services_active.assert_called_once_with([constants.PCMK_SERVICE, constants.SBD_SERVICE])
         mock_is_using_disk_based_sbd.assert_called_once()
         mock_is_using_diskless_sbd.assert_called_once()
 
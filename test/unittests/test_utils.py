@@ -3,6 +3,8 @@
 #
 # unit tests for utils.py
 
+import collections
+import errno
 import os
 import socket
 import re
@@ -10,10 +12,9 @@ import unittest
 import pytest
 import logging
 from unittest import mock
-from itertools import chain
 
 import crmsh.utils
-from crmsh import utils, config, tmpfiles, constants, options
+from crmsh import utils, config, constants, options
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -26,26 +27,20 @@ def test_package_is_installed_local(mock_run):
     mock_run.assert_called_once_with("rpm -q --quiet crmsh")
 
 
+@pytest.mark.parametrize("is_remote, expected", [(True, "node1"), (False, "1")])
 @mock.patch('crmsh.xmlutil.CrmMonXmlParser')
-def test_get_nodeid_from_name_remote(mock_parser):
+def test_get_nodeid_from_name(mock_parser, is_remote, expected):
     mock_parser_inst = mock.Mock()
     mock_parser.return_value = mock_parser_inst
-    mock_parser_inst.is_node_remote.return_value = True
-    assert utils.get_nodeid_from_name("node1") == "node1"
-    mock_parser.assert_called_once_with()
-    mock_parser_inst.is_node_remote.assert_called_once_with("node1")
-
-
-@mock.patch('crmsh.xmlutil.CrmMonXmlParser')
-def test_get_nodeid_from_name(mock_parser):
-    mock_parser_inst = mock.Mock()
-    mock_parser.return_value = mock_parser_inst
-    mock_parser_inst.is_node_remote.return_value = False
+    mock_parser_inst.is_node_remote.return_value = is_remote
     mock_parser_inst.get_node_id_from_name.return_value = "1"
-    assert utils.get_nodeid_from_name("node1") == "1"
+    assert utils.get_nodeid_from_name("node1") == expected
     mock_parser.assert_called_once_with()
     mock_parser_inst.is_node_remote.assert_called_once_with("node1")
-    mock_parser_inst.get_node_id_from_name.assert_called_once_with("node1")
+    if is_remote:
+        mock_parser_inst.get_node_id_from_name.assert_not_called()
+    else:
+        mock_parser_inst.get_node_id_from_name.assert_called_once_with("node1")
 
 
 @mock.patch('crmsh.sh.LocalShell.get_rc_and_error')
@@ -77,13 +72,17 @@ def test_list_cluster_nodes_except_me_exception(mock_list_nodes):
     mock_list_nodes.assert_called_once_with()
 
 
+@pytest.mark.parametrize("node_list, expected", [
+    (["node1", "node2"], ["node2"]),
+    (["node2", "node3"], ["node2", "node3"]),
+])
 @mock.patch('crmsh.utils.this_node')
 @mock.patch('crmsh.utils.list_cluster_nodes')
-def test_list_cluster_nodes_except_me(mock_list_nodes, mock_this_node):
-    mock_list_nodes.return_value = ["node1", "node2"]
+def test_list_cluster_nodes_except_me(mock_list_nodes, mock_this_node, node_list, expected):
+    mock_list_nodes.return_value = node_list
     mock_this_node.return_value = "node1"
     res = utils.list_cluster_nodes_except_me()
-    assert res == ["node2"]
+    assert res == expected
     mock_list_nodes.assert_called_once_with()
     mock_this_node.assert_called_once_with()
 
@@ -104,6 +103,23 @@ def test_systeminfo():
     assert utils.get_tempdir() is not None
 
 
+@mock.patch('pwd.getpwuid')
+@mock.patch('os.geteuid')
+def test_getuser_cached_per_euid(mock_geteuid, mock_getpwuid):
+    from crmsh import userdir
+    userdir._user_name.cache_clear()
+    mock_getpwuid.side_effect = lambda uid: mock.Mock(pw_name=f'user{uid}')
+    try:
+        mock_geteuid.return_value = 1000
+        assert utils.getuser() == 'user1000'
+        assert utils.getuser() == 'user1000'
+        mock_geteuid.return_value = 0
+        assert utils.getuser() == 'user0'
+        assert mock_getpwuid.call_args_list == [mock.call(1000), mock.call(0)]
+    finally:
+        userdir._user_name.cache_clear()
+
+
 def test_shadowcib():
     assert utils.get_cib_in_use() == ""
     utils.set_cib_in_use("foo")
@@ -112,26 +128,33 @@ def test_shadowcib():
     assert utils.get_cib_in_use() == ""
 
 
-def test_booleans():
-    truthy = ['yes', 'Yes', 'True', 'true', 'TRUE',
-              'YES', 'on', 'On', 'ON']
-    falsy = ['no', 'false', 'off', 'OFF', 'FALSE', 'nO']
-    not_truthy = ['', 'not', 'ONN', 'TRUETH', 'yess']
-    for case in chain(truthy, falsy):
-        assert utils.verify_boolean(case) is True
-    for case in truthy:
-        assert utils.is_boolean_true(case) is True
-        assert utils.is_boolean_false(case) is False
-        assert utils.get_boolean(case) is True
-    for case in falsy:
-        assert utils.is_boolean_true(case) is False
-        assert utils.is_boolean_false(case) is True
-        assert utils.get_boolean(case, dflt=True) is False
-    for case in not_truthy:
-        assert utils.verify_boolean(case) is False
-        assert utils.is_boolean_true(case) is False
-        assert utils.is_boolean_false(case) is False
-        assert utils.get_boolean(case) is False
+_TRUTHY = ['yes', 'Yes', 'True', 'true', 'TRUE', 'YES', 'on', 'On', 'ON']
+_FALSY = ['no', 'false', 'off', 'OFF', 'FALSE', 'nO']
+_NOT_TRUTHY = ['', 'not', 'ONN', 'TRUETH', 'yess']
+
+
+@pytest.mark.parametrize("case", _TRUTHY)
+def test_boolean_truthy(case):
+    assert utils.verify_boolean(case) is True
+    assert utils.is_boolean_true(case) is True
+    assert utils.is_boolean_false(case) is False
+    assert utils.get_boolean(case) is True
+
+
+@pytest.mark.parametrize("case", _FALSY)
+def test_boolean_falsy(case):
+    assert utils.verify_boolean(case) is True
+    assert utils.is_boolean_true(case) is False
+    assert utils.is_boolean_false(case) is True
+    assert utils.get_boolean(case, dflt=True) is False
+
+
+@pytest.mark.parametrize("case", _NOT_TRUTHY)
+def test_boolean_not_truthy(case):
+    assert utils.verify_boolean(case) is False
+    assert utils.is_boolean_true(case) is False
+    assert utils.is_boolean_false(case) is False
+    assert utils.get_boolean(case) is False
 
 
 def test_olist():
@@ -144,6 +167,19 @@ def test_olist():
     assert list(lst) == ['b', 'c', 'a', 'f', 'aa', '_']
 
 
+def test_olist_contains_after_mutation():
+    lst = utils.olist(['A', 'b', 'C'])
+    lst.remove('a')
+    assert 'a' not in lst
+    assert lst.pop() == 'c'
+    assert 'C' not in lst
+    lst[0] = 'z'
+    assert 'Z' in lst
+    assert 'b' not in lst
+    lst.clear()
+    assert 'z' not in lst
+
+
 def test_add_sudo():
     tmpuser = config.core.user
     try:
@@ -164,29 +200,33 @@ def test_str2tmp():
     os.unlink(filename)
 
 
+@pytest.mark.parametrize("path", [
+    'foo/bar', 'foo', '/foo/bar', 'foo0', 'foo_bar', 'foo-bar', '0foo', '.foo', 'foo.bar',
+])
+def test_sane_path(path):
+    assert utils.is_path_sane(path)
+
+
+@pytest.mark.parametrize("path", ['#foo', 'foo?', 'foo*', 'foo$', 'foo[bar]', 'foo`', "foo'", 'foo/*'])
+@mock.patch('logging.Logger.error')
+def test_insane_path(mock_error, path):
+    assert not utils.is_path_sane(path)
+
+
+@pytest.mark.parametrize("filename", ['foo', '0foo', '0', '.foo'])
+def test_sane_filename(filename):
+    assert utils.is_filename_sane(filename)
+
+
 @mock.patch('logging.Logger.error')
-def test_sanity(mock_error):
-    sane_paths = ['foo/bar', 'foo', '/foo/bar', 'foo0',
-                  'foo_bar', 'foo-bar', '0foo', '.foo',
-                  'foo.bar']
-    insane_paths = ['#foo', 'foo?', 'foo*', 'foo$', 'foo[bar]',
-                    'foo`', "foo'", 'foo/*']
-    for p in sane_paths:
-        assert utils.is_path_sane(p)
-    for p in insane_paths:
-        assert not utils.is_path_sane(p)
-    sane_filenames = ['foo', '0foo', '0', '.foo']
-    insane_filenames = ['foo/bar']
-    for p in sane_filenames:
-        assert utils.is_filename_sane(p)
-    for p in insane_filenames:
-        assert not utils.is_filename_sane(p)
-    sane_names = ['foo']
-    insane_names = ["f'o"]
-    for n in sane_names:
-        assert utils.is_name_sane(n)
-    for n in insane_names:
-        assert not utils.is_name_sane(n)
+def test_insane_filename(mock_error):
+    assert not utils.is_filename_sane('foo/bar')
+
+
+@mock.patch('logging.Logger.error')
+def test_name_sanity(mock_error):
+    assert utils.is_name_sane('foo')
+    assert not utils.is_name_sane("f'o")
 
 
 def test_nvpairs2dict():
@@ -207,9 +247,13 @@ def test_msec():
     assert utils.crm_msec('1') == 1000
     assert utils.crm_msec('1m') == 60*1000
     assert utils.crm_msec('1h') == 60*60*1000
+    assert utils.crm_msec(' 2 MIN') == 2*60*1000
+    assert utils.crm_msec('3000usec') == 3
+    assert utils.crm_msec('1d') == -1
+    assert utils.crm_msec('') == -1
 
 
-def test_parse_sysconfig():
+def test_parse_sysconfig(tmp_path):
     """
     bsc#1129317: Fails on this line
 
@@ -219,31 +263,31 @@ def test_parse_sysconfig():
 FW_SERVICES_ACCEPT_EXT="0/0,tcp,22,,hitcount=3,blockseconds=60,recentname=ssh"
 '''
 
-    fd, fname = tmpfiles.create()
-    with open(fname, 'w') as f:
-        f.write(s)
+    fname = tmp_path / "sysconfig"
+    fname.write_text(s)
+    fname = str(fname)
     sc = utils.parse_sysconfig(fname)
     assert ("FW_SERVICES_ACCEPT_EXT" in sc)
 
-def test_sysconfig_set():
+def test_sysconfig_set(tmp_path):
     s = '''
 FW_SERVICES_ACCEPT_EXT="0/0,tcp,22,,hitcount=3,blockseconds=60,recentname=ssh"
 '''
-    fd, fname = tmpfiles.create()
-    with open(fname, 'w') as f:
-        f.write(s)
+    fname = tmp_path / "sysconfig"
+    fname.write_text(s)
+    fname = str(fname)
     utils.sysconfig_set(fname, FW_SERVICES_ACCEPT_EXT="foo=bar", FOO="bar")
     sc = utils.parse_sysconfig(fname)
     assert (sc.get("FW_SERVICES_ACCEPT_EXT") == "foo=bar")
     assert (sc.get("FOO") == "bar")
 
-def test_sysconfig_set_bsc1145823():
+def test_sysconfig_set_bsc1145823(tmp_path):
     s = '''# this is test
 #age=1000
 '''
-    fd, fname = tmpfiles.create()
-    with open(fname, 'w') as f:
-        f.write(s)
+    fname = tmp_path / "sysconfig"
+    fname.write_text(s)
+    fname = str(fname)
     utils.sysconfig_set(fname, age="100")
     sc = utils.parse_sysconfig(fname)
     assert (sc.get("age") == "100")
@@ -255,7 +299,7 @@ def test_sysconfig_set_bsc1145823():
 def test_check_port_open_false(mock_sleep, mock_selector_cls, mock_socket, mock_getaddrinfo):
     sock_inst = mock.Mock()
     mock_socket.return_value = sock_inst
-    sock_inst.connect_ex.return_value = 1
+    sock_inst.connect_ex.return_value = errno.EINPROGRESS
     mock_getaddrinfo.return_value = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 22))]
 
     mock_selector = mock.Mock()
@@ -270,6 +314,26 @@ def test_check_port_open_false(mock_sleep, mock_selector_cls, mock_socket, mock_
     assert mock_selector.select.call_count == 3
     assert mock_sleep.call_count == 2
 
+@mock.patch("socket.getaddrinfo")
+@mock.patch("socket.socket")
+@mock.patch("selectors.DefaultSelector")
+@mock.patch("time.sleep")
+def test_check_port_open_refused(mock_sleep, mock_selector_cls, mock_socket, mock_getaddrinfo):
+    sock_inst = mock.Mock()
+    mock_socket.return_value = sock_inst
+    sock_inst.connect_ex.return_value = errno.ECONNREFUSED
+    mock_getaddrinfo.return_value = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 22))]
+
+    mock_selector = mock.Mock()
+    mock_selector_cls.return_value = mock_selector
+
+    assert utils.check_port_open("localhost", 22) is False
+
+    assert sock_inst.connect_ex.call_count == 3
+    assert sock_inst.close.call_count == 3
+    mock_selector.register.assert_not_called()
+    mock_selector.select.assert_not_called()
+
 @mock.patch("socket.getaddrinfo")
 @mock.patch("socket.socket")
 @mock.patch("selectors.DefaultSelector")
@@ -301,33 +365,15 @@ def test_get_nodeinfo_from_cmaptool_return_none(mock_get_stdout):
     mock_get_stdout.assert_called_once_with("corosync-cmapctl -b runtime.members")
 
 
-@mock.patch("re.findall")
-@mock.patch("re.search")
 @mock.patch("crmsh.sh.ShellUtils.get_stdout")
-def test_get_nodeinfo_from_cmaptool(mock_get_stdout, mock_search, mock_findall):
-    mock_get_stdout.return_value = (0, 'runtime.members.1.ip (str) = r(0) ip(192.168.43.129)\nruntime.members.2.ip (str) = r(0) ip(192.168.43.128)')
-    match_inst1 = mock.Mock()
-    match_inst2 = mock.Mock()
-    mock_search.side_effect = [match_inst1, match_inst2]
-    match_inst1.group.return_value = '1'
-    match_inst2.group.return_value = '2'
-    mock_findall.side_effect = [["192.168.43.129"], ["192.168.43.128"]]
-
+def test_get_nodeinfo_from_cmaptool(mock_get_stdout):
+    mock_get_stdout.return_value = (0, '''runtime.members.1.config_version (u64) = 0
+runtime.members.1.ip (str) = r(0) ip(192.168.43.129) r(1) ip(10.10.10.129)
+runtime.members.1.join_count (u32) = 1
+runtime.members.2.ip (str) = r(0) ip(192.168.43.128)''')
     result = utils.get_nodeinfo_from_cmaptool()
-    assert result['1'] == ["192.168.43.129"]
-    assert result['2'] == ["192.168.43.128"]
-
+    assert result == {'1': ["192.168.43.129", "10.10.10.129"], '2': ["192.168.43.128"]}
     mock_get_stdout.assert_called_once_with("corosync-cmapctl -b runtime.members")
-    mock_search.assert_has_calls([
-        mock.call(r'members\.(.*)\.ip', 'runtime.members.1.ip (str) = r(0) ip(192.168.43.129)'),
-        mock.call(r'members\.(.*)\.ip', 'runtime.members.2.ip (str) = r(0) ip(192.168.43.128)')
-    ])
-    match_inst1.group.assert_called_once_with(1)
-    match_inst2.group.assert_called_once_with(1)
-    mock_findall.assert_has_calls([
-        mock.call(r'[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}', 'runtime.members.1.ip (str) = r(0) ip(192.168.43.129)'),
-        mock.call(r'[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}', 'runtime.members.2.ip (str) = r(0) ip(192.168.43.128)')
-    ])
 
 @mock.patch("crmsh.utils.get_nodeinfo_from_cmaptool")
 @mock.patch("crmsh.service_manager.ServiceManager.service_is_active")
@@ -337,21 +383,13 @@ def test_valid_nodeid_false_service_not_active(mock_is_active, mock_nodeinfo):
     mock_is_active.assert_called_once_with('corosync.service')
     mock_nodeinfo.assert_not_called()
 
+@pytest.mark.parametrize("nodeid, expected", [("3", False), ("2", True)])
 @mock.patch("crmsh.utils.get_nodeinfo_from_cmaptool")
 @mock.patch("crmsh.service_manager.ServiceManager.service_is_active")
-def test_valid_nodeid_false(mock_is_active, mock_nodeinfo):
-    mock_is_active.return_value = True
-    mock_nodeinfo.return_value = {'1': ["10.10.10.1"], "2": ["20.20.20.2"]}
-    assert utils.valid_nodeid("3") is False
-    mock_is_active.assert_called_once_with('corosync.service')
-    mock_nodeinfo.assert_called_once_with()
-
-@mock.patch("crmsh.utils.get_nodeinfo_from_cmaptool")
-@mock.patch("crmsh.service_manager.ServiceManager.service_is_active")
-def test_valid_nodeid_true(mock_is_active, mock_nodeinfo):
+def test_valid_nodeid(mock_is_active, mock_nodeinfo, nodeid, expected):
     mock_is_active.return_value = True
     mock_nodeinfo.return_value = {'1': ["10.10.10.1"], "2": ["20.20.20.2"]}
-    assert utils.valid_nodeid("2") is True
+    assert utils.valid_nodeid(nodeid) is expected
     mock_is_active.assert_called_once_with('corosync.service')
     mock_nodeinfo.assert_called_once_with()
 
@@ -427,159 +465,130 @@ def test_detect_gcp(mock_run, mock_request):
     assert utils.detect_gcp() is True
     mock_run.assert_called_once_with("dmidecode -s bios-vendor")
 
-@mock.patch("crmsh.utils.is_program")
-def test_detect_cloud_no_cmd(mock_is_program):
+@pytest.fixture
+def cloud_detectors():
+    with mock.patch("crmsh.utils.is_program") as mock_is_program, \
+            mock.patch("crmsh.utils.detect_aws") as mock_aws, \
+            mock.patch("crmsh.utils.detect_azure") as mock_azure, \
+            mock.patch("crmsh.utils.detect_gcp") as mock_gcp:
+        mock_is_program.return_value = True
+        mock_aws.return_value = False
+        mock_azure.return_value = False
+        mock_gcp.return_value = False
+        yield mock_is_program, mock_aws, mock_azure, mock_gcp
+
+
+def test_detect_cloud_no_cmd(cloud_detectors):
+    mock_is_program, mock_aws, _, _ = cloud_detectors
     mock_is_program.return_value = False
     assert utils.detect_cloud() is None
     mock_is_program.assert_called_once_with("dmidecode")
-
-@mock.patch("crmsh.utils.detect_aws")
-@mock.patch("crmsh.utils.is_program")
-def test_detect_cloud_aws(mock_is_program, mock_aws):
-    mock_is_program.return_value = True
-    mock_aws.return_value = True
-    assert utils.detect_cloud.__wrapped__() == constants.CLOUD_AWS
+    mock_aws.assert_not_called()
+
+@pytest.mark.parametrize("aws, azure, gcp, expected", [
+    (True, False, False, constants.CLOUD_AWS),
+    (False, True, False, constants.CLOUD_AZURE),
+    (False, False, True, constants.CLOUD_GCP),
+    (False, False, False, None),
+])
+def test_detect_cloud(cloud_detectors, aws, azure, gcp, expected):
+    mock_is_program, mock_aws, mock_azure, mock_gcp = cloud_detectors
+    mock_aws.return_value = aws
+    mock_azure.return_value = azure
+    mock_gcp.return_value = gcp
+    assert utils.detect_cloud.__wrapped__() == expected
     mock_is_program.assert_called_once_with("dmidecode")
     mock_aws.assert_called_once_with()
+    assert mock_azure.call_count == (0 if aws else 1)
+    assert mock_gcp.call_count == (0 if aws or azure else 1)
 
-@mock.patch("crmsh.utils.detect_azure")
-@mock.patch("crmsh.utils.detect_aws")
-@mock.patch("crmsh.utils.is_program")
-def test_detect_cloud_azure(mock_is_program, mock_aws, mock_azure):
-    mock_is_program.return_value = True
-    mock_aws.return_value = False
-    mock_azure.return_value = True
-    assert utils.detect_cloud.__wrapped__() == constants.CLOUD_AZURE
-    mock_is_program.assert_called_once_with("dmidecode")
-    mock_aws.assert_called_once_with()
-    mock_azure.assert_called_once_with()
-
-@mock.patch("crmsh.utils.detect_gcp")
-@mock.patch("crmsh.utils.detect_azure")
-@mock.patch("crmsh.utils.detect_aws")
-@mock.patch("crmsh.utils.is_program")
-def test_detect_cloud_gcp(mock_is_program, mock_aws, mock_azure, mock_gcp):
-    mock_is_program.return_value = True
-    mock_aws.return_value = False
-    mock_azure.return_value = False
-    mock_gcp.return_value = True
-    assert utils.detect_cloud.__wrapped__() == constants.CLOUD_GCP
-    mock_is_program.assert_called_once_with("dmidecode")
-    mock_aws.assert_called_once_with()
-    mock_azure.assert_called_once_with()
-    mock_gcp.assert_called_once_with()
 
+@pytest.fixture(scope="module")
+def ip_inst():
+    return utils.IP("10.10.10.1")
 
-class TestIP(unittest.TestCase):
-    """
-    Unitary tests for class utils.IP
-    """
-    @classmethod
-    def setUpClass(cls):
-        """
-        Global setUp.
-        """
 
-    def setUp(self):
-        """
-        Test setUp.
-        """
-        self.ip_inst = utils.IP("10.10.10.1")
+@pytest.fixture(scope="module")
+def interface():
+    return utils.Interface("10.10.10.123/24")
 
-    def tearDown(self):
-        """
-        Test tearDown.
-        """
 
-    @classmethod
-    def tearDownClass(cls):
-        """
-        Global tearDown.
-        """
+@mock.patch('ipaddress.ip_address')
+def test_ip_address(mock_ip_address, ip_inst):
+    mock_ip_address_inst = mock.Mock()
+    mock_ip_address.return_value = mock_ip_address_inst
+    ip_inst.ip_address
+    mock_ip_address.assert_called_once_with("10.10.10.1")
 
-    @mock.patch('ipaddress.ip_address')
-    def test_ip_address(self, mock_ip_address):
-        mock_ip_address_inst = mock.Mock()
-        mock_ip_address.return_value = mock_ip_address_inst
-        self.ip_inst.ip_address
-        mock_ip_address.assert_called_once_with("10.10.10.1")
-
-    @mock.patch('crmsh.utils.IP.ip_address', new_callable=mock.PropertyMock)
-    def test_version(self, mock_ip_address):
-        mock_ip_address_inst = mock.Mock(version=4)
-        mock_ip_address.return_value = mock_ip_address_inst
-        res = self.ip_inst.version
-        self.assertEqual(res, mock_ip_address_inst.version)
-        mock_ip_address.assert_called_once_with()
-
-    @mock.patch('crmsh.utils.IP.ip_address', new_callable=mock.PropertyMock)
-    def test_is_mcast(self, mock_ip_address):
-        mock_ip_address_inst = mock.Mock(is_multicast=False)
-        mock_ip_address.return_value = mock_ip_address_inst
-        res = utils.IP.is_mcast("10.10.10.1")
-        self.assertEqual(res, False)
-        mock_ip_address.assert_called_once_with()
-
-    @mock.patch('crmsh.utils.IP.version', new_callable=mock.PropertyMock)
-    def test_is_ipv6(self, mock_version):
-        mock_version.return_value = 4
-        res = utils.IP.is_ipv6("10.10.10.1")
-        self.assertEqual(res, False)
-        mock_version.assert_called_once_with()
-
-    @mock.patch('crmsh.utils.IP.ip_address', new_callable=mock.PropertyMock)
-    def test_is_loopback(self, mock_ip_address):
-        mock_ip_address_inst = mock.Mock(is_loopback=False)
-        mock_ip_address.return_value = mock_ip_address_inst
-        res = self.ip_inst.is_loopback
-        self.assertEqual(res, mock_ip_address_inst.is_loopback)
-        mock_ip_address.assert_called_once_with()
-
-
-class TestInterface(unittest.TestCase):
-    """
-    Unitary tests for class utils.Interface
-    """
-    @classmethod
-    def setUpClass(cls):
-        """
-        Global setUp.
-        """
 
-    def setUp(self):
-        """
-        Test setUp.
-        """
-        self.interface = utils.Interface("10.10.10.123/24")
+@mock.patch('crmsh.utils.IP.ip_address', new_callable=mock.PropertyMock)
+def test_ip_version(mock_ip_address, ip_inst):
+    mock_ip_address_inst = mock.Mock(version=4)
+    mock_ip_address.return_value = mock_ip_address_inst
+    assert ip_inst.version == mock_ip_address_inst.version
+    mock_ip_address.assert_called_once_with()
 
-    def tearDown(self):
-        """
-        Test tearDown.
-        """
 
-    @classmethod
-    def tearDownClass(cls):
-        """
-        Global tearDown.
-        """
+@mock.patch('crmsh.utils.IP.ip_address', new_callable=mock.PropertyMock)
+def test_ip_is_mcast(mock_ip_address):
+    mock_ip_address_inst = mock.Mock(is_multicast=False)
+    mock_ip_address.return_value = mock_ip_address_inst
+    assert utils.IP.is_mcast("10.10.10.1") is False
+    mock_ip_address.assert_called_once_with()
+
+
+@pytest.mark.parametrize("addr, expected", [("10.10.10.1", False), ("2001:db8::1", True)])
+def test_ip_is_ipv6(addr, expected):
+    assert utils.IP.is_ipv6(addr) is expected
+
+
+@pytest.mark.parametrize("addr, expected", [("10.10.10.1", True), ("2001:db8::1", True), ("node1", False)])
+def test_ip_is_valid_ip(addr, expected):
+    assert utils.IP.is_valid_ip(addr) is expected
+
+
+@mock.patch('crmsh.utils.IP.ip_address', new_callable=mock.PropertyMock)
+def test_ip_is_loopback(mock_ip_address, ip_inst):
+    mock_ip_address_inst = mock.Mock(is_loopback=False)
+    mock_ip_address.return_value = mock_ip_address_inst
+    assert ip_inst.is_loopback == mock_ip_address_inst.is_loopback
+    mock_ip_address.assert_called_once_with()
+
+
+def test_interface_ip_with_mask(interface):
+    assert interface.ip_with_mask == "10.10.10.123/24"
+
 
-    def test_ip_with_mask(self):
-        assert self.interface.ip_with_mask == "10.10.10.123/24"
+@mock.patch('ipaddress.ip_interface')
+def test_interface_ip_interface(mock_ip_interface, interface):
+    utils._ip_interface.cache_clear()
+    mock_ip_interface_inst = mock.Mock()
+    mock_ip_interface.return_value = mock_ip_interface_inst
+    interface.ip_interface
+    mock_ip_interface.assert_called_once_with("10.10.10.123/24")
+    utils._ip_interface.cache_clear()
 
-    @mock.patch('ipaddress.ip_interface')
-    def test_ip_interface(self, mock_ip_interface):
-        mock_ip_interface_inst = mock.Mock()
-        mock_ip_interface.return_value = mock_ip_interface_inst
-        self.interface.ip_interface
-        mock_ip_interface.assert_called_once_with("10.10.10.123/24")
 
-    @mock.patch('crmsh.utils.Interface.ip_interface', new_callable=mock.PropertyMock)
-    def test_network(self, mock_ip_interface):
-        mock_ip_interface_inst = mock.Mock()
-        mock_ip_interface.return_value = mock_ip_interface_inst
-        mock_ip_interface_inst.network = mock.Mock(network_address="10.10.10.0")
-        assert self.interface.network == "10.10.10.0"
-        mock_ip_interface.assert_called_once_with()
+def test_interface_ip_interface_cached():
+    utils._ip_interface.cache_clear()
+    first = utils.Interface("10.10.10.123/24")
+    second = utils.Interface("10.10.10.123/24")
+    assert first.ip_interface is second.ip_interface
+    assert second.network == "10.10.10.0"
+    assert utils._ip_interface.cache_info().hits == 2
+
+
+@mock.patch('crmsh.utils.Interface.ip_interface', new_callable=mock.PropertyMock)
+def test_interface_network(mock_ip_interface, interface):
+    mock_ip_interface_inst = mock.Mock()
+    mock_ip_interface.return_value = mock_ip_interface_inst
+    mock_ip_interface_inst.network = mock.Mock(network_address="10.10.10.0")
+    assert interface.network == "10.10.10.0"
+    mock_ip_interface.assert_called_once_with()
+
+
+# stands in for utils.Interface where only its plain attributes are read
+FakeInterface = collections.namedtuple("FakeInterface", ["ip", "network"], defaults=[None, None])
 
 
 class TestInterfacesInfo(unittest.TestCase):
@@ -587,49 +596,67 @@ class TestInterfacesInfo(unittest.TestCase):
     Unitary tests for class utils.InterfacesInfo
     """
 
-    network_output_error = """1: lo    inet 127.0.0.1/8 scope host lo\\       valid_lft forever preferred_lft forever
-2: enp1s0    inet 192.168.122.241/24 brd 192.168.122.255 scope global enp1s0
-61: tun0    inet 10.163.45.46 peer 10.163.45.45/32 scope global tun0"""
-
-    @classmethod
-    def setUpClass(cls):
-        """
-        Global setUp.
-        """
+    network_output_error = """[{"ifindex": 1, "ifname": "lo", "addr_info": [{"family": "inet", "local": "127.0.0.1", "prefixlen": 8, "scope": "host"}]},
+{"ifindex": 2, "ifname": "enp1s0", "addr_info": [{"family": "inet", "local": "192.168.122.241", "prefixlen": 24, "broadcast": "192.168.122.255", "scope": "global"}]},
+{},
+{"ifindex": 3, "ifname": "enp2s0", "addr_info": []},
+{"ifindex": 61, "ifname": "tun0", "addr_info": [{"family": "inet", "local": "10.163.45.46", "address": "10.163.45.45", "prefixlen": 32, "scope": "global"}]}]"""
 
     def setUp(self):
         """
         Test setUp.
         """
         self.interfaces_info = utils.InterfacesInfo()
-        self.interfaces_info_with_custom_nic = utils.InterfacesInfo(custom_nic_addr_list=['eth1'])
-        self.interfaces_info_with_wrong_nic = utils.InterfacesInfo(custom_nic_addr_list=['eth7'])
         self.interfaces_info_fake = utils.InterfacesInfo()
         self.interfaces_info_fake._nic_info_dict = {
-                "eth0": [mock.Mock(ip="10.10.10.1", network="10.10.10.0"), mock.Mock(ip="10.10.10.2", network="10.10.10.0")],
-                "eth1": [mock.Mock(ip="20.20.20.1", network="20.20.20.0")]
+                "eth0": [FakeInterface("10.10.10.1", "10.10.10.0"), FakeInterface("10.10.10.2", "10.10.10.0")],
+                "eth1": [FakeInterface("20.20.20.1", "20.20.20.0")]
                 }
-        self.interfaces_info_fake._default_nic_list = ["eth7"]
-
-    def tearDown(self):
-        """
-        Test tearDown.
-        """
-
-    @classmethod
-    def tearDownClass(cls):
-        """
-        Global tearDown.
-        """
 
     @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
     def test_get_interfaces_info_no_address(self, mock_run):
-        only_lo = "1: lo    inet 127.0.0.1/8 scope host lo\\       valid_lft forever preferred_lft forever"
+        only_lo = '[{"ifindex": 1, "ifname": "lo", "addr_info": [{"family": "inet", "local": "127.0.0.1", "prefixlen": 8}]}]'
         mock_run.return_value = (0, only_lo, None)
         with self.assertRaises(ValueError) as err:
             self.interfaces_info.get_interfaces_info()
         self.assertEqual("No address configured", str(err.exception))
-        mock_run.assert_called_once_with("ip -4 -o addr show")
+        mock_run.assert_called_once_with("ip -j -4 addr show")
+
+    @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
+    def test_get_interfaces_info_skip_empty_entry(self, mock_run):
+        mock_run.return_value = (0, '[{}, {"ifname": "eth0", "addr_info": [{"local": "10.10.10.1", "prefixlen": 24}]}]', None)
+        self.interfaces_info.get_interfaces_info()
+        self.assertEqual(self.interfaces_info.nic_list, ["eth0"])
+        self.assertEqual(self.interfaces_info.ip_list, ["10.10.10.1"])
+
+    @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
+    def test_flatten_custom_nic_addr_list(self, mock_run):
+        mock_run.return_value = (0, self.network_output_error, None)
+        interfaces_info = utils.InterfacesInfo(custom_nic_addr_list=['enp1s0'])
+        interfaces_info.get_interfaces_info()
+        self.assertEqual(interfaces_info.nic_list, ['enp1s0'])
+        interfaces_info.flatten_custom_nic_addr_list()
+        self.assertEqual(interfaces_info.input_nic_list, ['enp1s0'])
+        self.assertEqual(interfaces_info.input_addr_list, ['192.168.122.241'])
+        self.assertEqual(interfaces_info.get_nic_name_by_addr('192.168.122.241'), 'enp1s0')
+        with self.assertRaises(ValueError):
+            interfaces_info.get_nic_name_by_addr('10.10.10.1')
+
+    @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
+    def test_derived_lists_reset_on_refresh(self, mock_run):
+        mock_run.side_effect = [
+            (0, '[{"ifname": "eth0", "addr_info": [{"local": "10.10.10.1", "prefixlen": 24}]}]', None),
+            (0, '[{"ifname": "eth1", "addr_info": [{"local": "20.20.20.1", "prefixlen": 24}]}]', None),
+        ]
+        interfaces_info = utils.InterfacesInfo()
+        interfaces_info.get_interfaces_info()
+        self.assertEqual(interfaces_info.ip_list, ["10.10.10.1"])
+        self.assertIs(interfaces_info.ip_list, interfaces_info.ip_list)
+        interfaces_info._nic_info_dict = {}
+        interfaces_info.get_interfaces_info()
+        self.assertEqual(interfaces_info.nic_list, ["eth1"])
+        self.assertEqual(interfaces_info.ip_list, ["20.20.20.1"])
+        self.assertEqual(interfaces_info.network_list, ["20.20.20.0"])
 
     def test_nic_list(self):
         res = self.interfaces_info_fake.nic_list
@@ -642,8 +669,8 @@ class TestInterfacesInfo(unittest.TestCase):
     @mock.patch('crmsh.utils.InterfacesInfo.interface_list', new_callable=mock.PropertyMock)
     def test_ip_list(self, mock_interface_list):
         mock_interface_list.return_value = [
-                mock.Mock(ip="10.10.10.1"),
-                mock.Mock(ip="10.10.10.2")
+                FakeInterface("10.10.10.1"),
+                FakeInterface("10.10.10.2")
                 ]
         res = self.interfaces_info_fake.ip_list
         self.assertEqual(res, ["10.10.10.1", "10.10.10.2"])
@@ -658,23 +685,21 @@ class TestInterfacesInfo(unittest.TestCase):
         mock_get_info.assert_called_once_with()
         mock_ip_list.assert_called_once_with()
 
-    @mock.patch('crmsh.utils.InterfacesInfo.ip_list', new_callable=mock.PropertyMock)
+    @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
     @mock.patch('crmsh.utils.IP.is_ipv6')
-    @mock.patch('crmsh.utils.InterfacesInfo.get_interfaces_info')
-    def test_ip_in_local(self, mock_get_info, mock_is_ipv6, mock_ip_list):
+    def test_ip_in_local(self, mock_is_ipv6, mock_run):
         mock_is_ipv6.return_value = False
-        mock_ip_list.return_value = ["10.10.10.1", "10.10.10.2"]
-        res = utils.InterfacesInfo.ip_in_local("10.10.10.1")
-        assert res is True
-        mock_get_info.assert_called_once_with()
-        mock_ip_list.assert_called_once_with()
-        mock_is_ipv6.assert_called_once_with("10.10.10.1")
+        mock_run.return_value = (0, self.network_output_error, None)
+        assert utils.InterfacesInfo.ip_in_local("192.168.122.241") is True
+        assert utils.InterfacesInfo.ip_in_local("127.0.0.1") is False
+        mock_run.assert_called_with("ip -j -4 addr show")
+        self.assertEqual(mock_is_ipv6.call_args_list, [mock.call("192.168.122.241"), mock.call("127.0.0.1")])
 
     @mock.patch('crmsh.utils.InterfacesInfo.interface_list', new_callable=mock.PropertyMock)
     def test_network_list(self, mock_interface_list):
         mock_interface_list.return_value = [
-                mock.Mock(network="10.10.10.0"),
-                mock.Mock(network="20.20.20.0")
+                FakeInterface(network="10.10.10.0"),
+                FakeInterface(network="20.20.20.0")
                 ]
         res = self.interfaces_info.network_list
         self.assertEqual(res, list(set(["10.10.10.0", "20.20.20.0"])))
@@ -699,6 +724,20 @@ class TestInterfacesInfo(unittest.TestCase):
 
         mock_run_inst.get_stdout_or_raise_error.assert_called_once_with("ip -o route show")
 
+    @mock.patch('crmsh.sh.cluster_shell')
+    def test_get_default_nic_from_route_not_first(self, mock_run):
+        mock_run.return_value.get_stdout_or_raise_error.return_value = """10.10.10.0/24 dev eth1 proto kernel scope link src 10.10.10.51
+default dev wg0 scope link
+default via 192.168.122.1 dev eth8"""
+        res = self.interfaces_info_fake.get_default_nic_from_route()
+        self.assertEqual(res, "eth8")
+
+    @mock.patch('crmsh.sh.cluster_shell')
+    def test_get_default_nic_from_route_no_default(self, mock_run):
+        mock_run.return_value.get_stdout_or_raise_error.return_value = "10.10.10.0/24 dev eth1 proto kernel scope link src 10.10.10.51 "
+        res = self.interfaces_info_fake.get_default_nic_from_route()
+        self.assertEqual(res, "eth0")
+
 
 @mock.patch("crmsh.utils.get_nodeid_from_name")
 def test_get_iplist_from_name_no_nodeid(mock_get_nodeid):
@@ -728,6 +767,8 @@ def test_get_iplist_from_name(mock_get_nodeid, mock_get_nodeinfo):
     assert res == ["10.10.10.1"]
     mock_get_nodeid.assert_called_once_with("test")
     mock_get_nodeinfo.assert_called_once_with()
+    mock_get_nodeid.return_value = "3"
+    assert utils.get_iplist_from_name("test") == []
 
 
 def test_calculate_quorate_status():
@@ -754,6 +795,8 @@ Flags:            Quorate
 def test_re_split_string():
     assert utils.re_split_string('[; ]', "/dev/sda1; /dev/sdb1 ; ") == ["/dev/sda1", "/dev/sdb1"]
     assert utils.re_split_string('[; ]', "/dev/sda1 ") == ["/dev/sda1"]
+    assert utils.re_split_string('[; ]', "/dev/sda1;;/dev/sdb1\t/dev/sdc1") == ["/dev/sda1", "/dev/sdb1\t/dev/sdc1"]
+    assert utils.re_split_string('[,]', "a,,b") == ["a", "b"]
 
 
 @mock.patch('crmsh.utils.get_dev_info')
@@ -782,10 +825,10 @@ def test_compare_uuid_with_peer_dev_cannot_find_peer(mock_get_dev_uuid):
     with pytest.raises(ValueError) as err:
         utils.compare_uuid_with_peer_dev(["/dev/sdb1"], "node2")
     assert str(err.value) == "Cannot find UUID for /dev/sdb1 on node2"
-    mock_get_dev_uuid.assert_has_calls([
+    assert mock_get_dev_uuid.call_args_list == [
         mock.call("/dev/sdb1"),
         mock.call("/dev/sdb1", "node2")
-        ])
+        ]
 
 
 @mock.patch('crmsh.utils.get_dev_uuid')
@@ -794,10 +837,10 @@ def test_compare_uuid_with_peer_dev(mock_get_dev_uuid):
     with pytest.raises(ValueError) as err:
         utils.compare_uuid_with_peer_dev(["/dev/sdb1"], "node2")
     assert str(err.value) == "UUID of /dev/sdb1 not same with peer node2"
-    mock_get_dev_uuid.assert_has_calls([
+    assert mock_get_dev_uuid.call_args_list == [
         mock.call("/dev/sdb1"),
         mock.call("/dev/sdb1", "node2")
-        ])
+        ]
 
 
 @mock.patch('crmsh.utils.get_dev_info')
@@ -881,13 +924,13 @@ def test_gen_unused_id(mock_rand):
     mock_rand.assert_called_once_with(6)
 
 
-@mock.patch('random.choice')
+@mock.patch('random.choices')
 def test_randomword(mock_rand):
     import string
-    mock_rand.side_effect = ['z', 'f', 'k', 'e', 'c', 'd']
+    mock_rand.return_value = ['z', 'f', 'k', 'e', 'c', 'd']
     res = utils.randomword()
     assert res == "zfkecd"
-    mock_rand.assert_has_calls([mock.call(string.ascii_lowercase) for x in range(6)])
+    mock_rand.assert_called_once_with(string.ascii_lowercase, k=6)
 
 
 @mock.patch('crmsh.cibconfig.cib_factory')
@@ -942,13 +985,11 @@ fencing-sbd
 @mock.patch('crmsh.utils.S_ISBLK')
 @mock.patch('os.stat')
 def test_is_block_device_error(mock_stat, mock_isblk):
-    mock_stat_inst = mock.Mock(st_mode=12345)
-    mock_stat.return_value = mock_stat_inst
-    mock_isblk.side_effect = OSError
+    mock_stat.side_effect = FileNotFoundError
     res = utils.is_block_device("/dev/sda1")
     assert res is False
     mock_stat.assert_called_once_with("/dev/sda1")
-    mock_isblk.assert_called_once_with(12345)
+    mock_isblk.assert_not_called()
 
 
 @mock.patch('crmsh.utils.S_ISBLK')
@@ -994,6 +1035,28 @@ def test_check_all_nodes_reachable(mock_xml, mock_reachable, mock_user_of_host,
     mock_reachable.assert_called_once_with("node1")
 
 
+@mock.patch('crmsh.utils.this_node')
+@mock.patch('crmsh.utils.ssh_port_reachable_check')
+@mock.patch('crmsh.xmlutil.CrmMonXmlParser')
+def test_check_all_nodes_reachable_unreachable_nodes(mock_xml, mock_reachable, mock_this_node):
+    mock_xml.return_value.not_connected.return_value = True
+    mock_this_node.return_value = "node1"
+
+    def reachable(node):
+        if node == "node3":
+            raise ValueError("unreachable")
+        return True
+    mock_reachable.side_effect = reachable
+
+    with mock.patch('crmsh.utils.list_cluster_nodes_except_me', return_value=["node2", "node3"]):
+        with pytest.raises(utils.DeadNodeError) as err:
+            utils.check_all_nodes_reachable("testing", check_passwd=False)
+    assert err.value.summary.dead_nodes == ["node3"]
+    assert err.value.summary.nodes_unreachable == ["node3"]
+    assert err.value.summary.reachable_nodes == ["node2"]
+    assert sorted(c.args[0] for c in mock_reachable.call_args_list) == ["node2", "node3"]
+
+
 @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
 def test_detect_virt(mock_run):
     mock_run.return_value = (0, None, None)
@@ -1072,41 +1135,33 @@ def test_list_cluster_nodes_none(mock_run, mock_etree, mock_get_cluster_nodes):
     mock_get_cluster_nodes.assert_not_called()
 
 
-@mock.patch('crmsh.cibquery.get_cluster_nodes')
-@mock.patch('os.path.isfile')
-@mock.patch('os.getenv')
-@mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
-def test_list_cluster_nodes_cib_not_exist(mock_run, mock_env, mock_isfile, mock_get_cluster_nodes):
-    mock_run.return_value = (1, None, None)
-    mock_env.return_value = constants.CIB_RAW_FILE
-    mock_isfile.return_value = False
-    res = utils.list_cluster_nodes()
-    assert res is None
-    mock_run.assert_called_once_with(constants.CIB_QUERY, no_reg=False)
-    mock_env.assert_called_once_with("CIB_file", constants.CIB_RAW_FILE)
-    mock_isfile.assert_called_once_with(constants.CIB_RAW_FILE)
-    mock_get_cluster_nodes.assert_not_called()
-
-
+@pytest.mark.parametrize("cib_exists", [False, True])
 @mock.patch('crmsh.cibquery.get_cluster_nodes')
 @mock.patch('crmsh.xmlutil.file2cib_elem')
 @mock.patch('os.path.isfile')
 @mock.patch('os.getenv')
 @mock.patch('crmsh.sh.ShellUtils.get_stdout_stderr')
-def test_list_cluster_nodes(mock_run, mock_env, mock_isfile, mock_file2elem, mock_get_cluster_nodes):
+def test_list_cluster_nodes_from_cib_file(mock_run, mock_env, mock_isfile, mock_file2elem, mock_get_cluster_nodes, cib_exists):
     mock_run.return_value = (1, None, None)
     mock_env.return_value = constants.CIB_RAW_FILE
-    mock_isfile.return_value = True
+    mock_isfile.return_value = cib_exists
     mock_cib_inst = mock.Mock()
     mock_file2elem.return_value = mock_cib_inst
+    mock_get_cluster_nodes.return_value = [mock.Mock(uname="node1")]
 
     res = utils.list_cluster_nodes()
 
     mock_run.assert_called_once_with(constants.CIB_QUERY, no_reg=False)
     mock_env.assert_called_once_with("CIB_file", constants.CIB_RAW_FILE)
     mock_isfile.assert_called_once_with(constants.CIB_RAW_FILE)
-    mock_file2elem.assert_called_once_with(constants.CIB_RAW_FILE)
-    mock_get_cluster_nodes.assert_called_once_with(mock_cib_inst)
+    if cib_exists:
+        assert res == ["node1"]
+        mock_file2elem.assert_called_once_with(constants.CIB_RAW_FILE)
+        mock_get_cluster_nodes.assert_called_once_with(mock_cib_inst)
+    else:
+        assert res is None
+        mock_file2elem.assert_not_called()
+        mock_get_cluster_nodes.assert_not_called()
 
 
 @mock.patch('crmsh.utils.DeprecatedTermTranslator')